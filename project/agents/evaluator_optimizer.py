@@ -5,10 +5,21 @@ This module implements iterative validation and correction of SWIFT messages.
 The evaluator identifies issues, and the optimizer corrects them.
 """
 
-from typing import Dict, List, Any, Tuple
+import asyncio
+import hashlib
+import json
+import re
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
 from agents.workflow_agents.base_agents import SwiftCorrectionAgent
-from config import Config
+from config import CONFIG
 from agents.workflow_agents.base_agents import EvaluatorAgent
+from services.log_service import get_logger
+
+logger = get_logger(__name__)
 
 
 class EvaluatorOptimizerPattern:
@@ -22,39 +33,150 @@ class EvaluatorOptimizerPattern:
     4. Repeats up to MAX_ITERATIONS times
     """
 
+    # Bank code (4 letters), country code (2 letters), location code
+    # (2 alphanumerics) and optional branch code (3 alphanumerics)
+    _BIC_RE = re.compile(r"[A-Za-z]{4}[A-Za-z]{2}[A-Za-z0-9]{2}(?:[A-Za-z0-9]{3})?")
+
+    # Maximum number of evaluator verdicts kept in the LRU cache
+    EVAL_CACHE_SIZE = 2048
+
     def __init__(self):
         """Initialize the evaluator-optimizer pattern."""
-        self.config = Config()
+        self.config = CONFIG
         self.MAX_ITERATIONS = 3
         self.correction_agent = SwiftCorrectionAgent()
         self.evaluator_agent = EvaluatorAgent()
+        self.correction_failures = 0
+        self.evaluation_failures = 0
 
-        # SWIFT validation rules
+        # LRU cache of evaluator verdicts keyed by message content
+        self._eval_cache: "OrderedDict[str, Tuple[bool, Tuple[str, ...]]]" = OrderedDict()
+
+        # SWIFT validation rules (frozensets give O(1) membership checks)
         self.SWIFT_STANDARDS = {
             "max_reference_length": 16,
             "max_amount": 999999999.99,
             "min_amount": 0.01,
-            "required_fields": [
+            "required_fields": tuple(sys.intern(field) for field in (
                 "message_type", "reference", "amount",
                 "sender_bic", "receiver_bic"
-            ],
-            "valid_message_types": ["MT103", "MT202"],
-            "valid_currencies": ["USD", "EUR", "GBP", "JPY", "CHF"]
+            )),
+            "valid_message_types": frozenset(sys.intern(t) for t in ("MT103", "MT202")),
+            "valid_currencies": frozenset(
+                sys.intern(c) for c in ("USD", "EUR", "GBP", "JPY", "CHF")
+            )
         }
 
-    def evaluate_message(self, message: Dict) -> Tuple[bool, List[str]]:
+    def evaluate_message(self, message: Dict, patch: Dict = None,
+                         prior_errors: List[str] = None) -> Tuple[bool, List[str]]:
         """
         Evaluate a SWIFT message for compliance with standards.
 
         Args:
             message: SWIFT message to evaluate
+            patch: Fields changed since the last evaluation; when given with
+                prior_errors, only the patch is sent to the evaluator
+            prior_errors: Errors found by the last evaluation
+
+        Returns:
+            Tuple of (is_valid, list_of_errors), or None if the evaluation request failed
+        """
+        key = self._message_key(message)
+        cached = self._get_cached_evaluation(key)
+        if cached is not None:
+            return cached
+
+        partial = bool(patch) and prior_errors is not None
+        if partial:
+            result = self.evaluator_agent.evaluate_patch(
+                message.get('message_id', 'Unknown'), patch, prior_errors
+            )
+        else:
+            result = self.evaluator_agent.evaluate(message)
+        return self._verdict(key, result, partial)
+
+    async def aevaluate_message(self, message: Dict, patch: Dict = None,
+                                prior_errors: List[str] = None) -> Tuple[bool, List[str]]:
+        """
+        Async variant of evaluate_message.
+
+        Args:
+            message: SWIFT message to evaluate
+            patch: Fields changed since the last evaluation; when given with
+                prior_errors, only the patch is sent to the evaluator
+            prior_errors: Errors found by the last evaluation
 
         Returns:
-            Tuple of (is_valid, list_of_errors)
+            Tuple of (is_valid, list_of_errors), or None if the evaluation request failed
+        """
+        key = self._message_key(message)
+        cached = self._get_cached_evaluation(key)
+        if cached is not None:
+            return cached
+
+        partial = bool(patch) and prior_errors is not None
+        if partial:
+            result = await self.evaluator_agent.aevaluate_patch(
+                message.get('message_id', 'Unknown'), patch, prior_errors
+            )
+        else:
+            result = await self.evaluator_agent.aevaluate(message)
+        return self._verdict(key, result, partial)
+
+    @staticmethod
+    def _message_key(message: Dict) -> str:
+        """
+        Hash the canonical JSON form of a message.
+
+        The key changes whenever a correction changes the message contents.
+        """
+        canonical = json.dumps(message, sort_keys=True, default=str)
+        return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+    def _get_cached_evaluation(self, key: str):
+        """Return a cached (is_valid, errors) verdict, or None on a miss."""
+        cached = self._eval_cache.get(key)
+        if cached is None:
+            return None
+        self._eval_cache.move_to_end(key)
+        is_valid, errors = cached
+        return is_valid, list(errors)
+
+    def _verdict(self, key: str, result: Any, partial: bool = False) -> Optional[Tuple[bool, List[str]]]:
         """
-        result = self.evaluator_agent.evaluate(message)
-        return result["is_valid"], result.get("errors", [])
+        Turn an evaluator response into an (is_valid, errors) verdict.
 
+        The LLM service returns {} when a request fails. Such responses carry
+        no verdict and are not cached, so a later run evaluates the message again.
+        Patch verdicts only re-validate the changed fields, so they are not
+        cached under the full message key either.
+
+        Args:
+            key: Cache key of the evaluated message
+            result: Parsed evaluator response
+            partial: Whether the response covers only a patch of the message
+
+        Returns:
+            Tuple of (is_valid, list_of_errors), or None if the response has no verdict
+        """
+        if not isinstance(result, dict) or "is_valid" not in result:
+            return None
+        if partial:
+            return result["is_valid"], list(result.get("errors", []))
+        return self._cache_evaluation(key, result["is_valid"], result.get("errors", []))
+
+    def _mark_evaluation_failed(self, message: Dict) -> None:
+        """Mark a message whose evaluation request failed as invalid."""
+        self.evaluation_failures += 1
+        message['validation_status'] = 'INVALID'
+        message['validation_errors'] = ["Evaluation failed: the evaluator returned no verdict"]
+
+    def _cache_evaluation(self, key: str, is_valid: bool, errors: List[str]) -> Tuple[bool, List[str]]:
+        """Store an evaluator verdict, evicting the least recently used entry."""
+        self._eval_cache[key] = (is_valid, tuple(errors))
+        if len(self._eval_cache) > self.EVAL_CACHE_SIZE:
+            self._eval_cache.popitem(last=False)
+        return is_valid, list(errors)
 
     def _validate_bic(self, bic: str) -> bool:
         """
@@ -75,27 +197,7 @@ class EvaluatorOptimizerPattern:
         if not bic:
             return False
 
-        # BIC must be 8 or 11 characters
-        if len(bic) not in [8, 11]:
-            return False
-
-        # First 4 characters must be letters (bank code)
-        if not bic[:4].isalpha():
-            return False
-
-        # Characters 5-6 must be letters (country code)
-        if not bic[4:6].isalpha():
-            return False
-
-        # Characters 7-8 must be alphanumeric (location code)
-        if not bic[6:8].isalnum():
-            return False
-
-        # If 11 characters, last 3 must be alphanumeric (branch code)
-        if len(bic) == 11 and not bic[8:11].isalnum():
-            return False
-
-        return True
+        return _is_valid_bic(bic)
 
     def optimize_message(self, message: Dict, errors: List[str]) -> Dict:
         """
@@ -108,15 +210,52 @@ class EvaluatorOptimizerPattern:
             message: SWIFT message to optimize
             errors: List of errors to correct
 
+        Returns:
+            Optimized message
+
+        Raises:
+            openai.OpenAIError: If the correction call fails after retries
+        """
+        corrected_message = self.correction_agent.respond(message, errors)
+        return self._apply_correction(message, errors, corrected_message)
+
+    async def aoptimize_message(self, message: Dict, errors: List[str]) -> Dict:
+        """
+        Async variant of optimize_message.
+
+        Args:
+            message: SWIFT message to optimize
+            errors: List of errors to correct
+
+        Returns:
+            Optimized message
+
+        Raises:
+            openai.OpenAIError: If the correction call fails after retries
+        """
+        corrected_message = await self.correction_agent.arespond(message, errors)
+        return self._apply_correction(message, errors, corrected_message)
+
+    def _apply_correction(self, message: Dict, errors: List[str], corrected_message: Any) -> Dict:
+        """
+        Merge the correction agent's output into the message.
+
+        Args:
+            message: SWIFT message being optimized
+            errors: Errors the correction was asked to fix
+            corrected_message: Fields returned by the correction agent
+
         Returns:
             Optimized message
         """
-        try:
-            corrected_message = self.correction_agent.respond(message, errors)
-            if isinstance(corrected_message, dict):
-                message.update(corrected_message)
-        except Exception as e:
-            print(f"Error during optimization: {e}")
+        if isinstance(corrected_message, dict):
+            # Only take over fields the errors point at, so fields the corrector
+            # echoed back or invented do not churn the message
+            touched_fields = self._error_fields(errors)
+            fields = corrected_message.keys() & touched_fields if touched_fields else corrected_message.keys()
+            for field in fields:
+                if message.get(field) != corrected_message[field]:
+                    message[field] = corrected_message[field]
 
         if "amount" in message and isinstance(message["amount"], str):
             parts = message["amount"].split()
@@ -126,62 +265,305 @@ class EvaluatorOptimizerPattern:
 
         return message
 
-    def process_with_evaluator_optimizer(self, messages: List[Dict]) -> List[Dict]:
+    @staticmethod
+    def _error_fields(errors: List[str]) -> frozenset:
         """
-        Process messages through the evaluator-optimizer pattern.
+        Collect the message fields named by a list of validation errors.
 
         Args:
-            messages: List of SWIFT messages to process
+            errors: Validation errors, e.g. "Invalid sender_bic: too short"
 
         Returns:
-            List of validated and optimized messages
+            Set of field names; empty if no error names a known field
+        """
+        fields = set()
+        for error in errors:
+            fields |= _parse_error_fields(str(error))
+        return frozenset(fields)
+
+    @staticmethod
+    def _diff_fields(before: Dict, after: Dict) -> Dict:
+        """Return the fields of after that were added or changed relative to before."""
+        return {k: v for k, v in after.items() if k not in before or before[k] != v}
+
+    async def _process_one(self, index: int, message: Dict, total: int,
+                           semaphore: asyncio.Semaphore) -> Dict:
         """
-        print("=" * 60)
-        print("EVALUATOR-OPTIMIZER PATTERN PROCESSING")
-        print("=" * 60)
+        Run the evaluate/optimize loop for a single message.
 
-        optimized_messages = []
+        Args:
+            index: Position of the message in the batch
+            message: SWIFT message to process
+            total: Number of messages in the batch
+            semaphore: Bounds the number of messages in flight
 
-        for i, message in enumerate(messages):
+        Returns:
+            Validated and optimized message
+        """
+        async with semaphore:
             if hasattr(message, "model_dump"):
                 message = message.model_dump()
-            # print(f"{i=}, {message=}")
-            print(f"\nProcessing message {i+1}/{len(messages)}: {message.get('message_id', 'Unknown')}")
+            message_id = message.get('message_id', 'Unknown')
+            logger.info(f"\nProcessing message {index+1}/{total}: {message_id}")
 
             # Iterative evaluation and optimization
+            prev_error_count = None
+            patch, errors = None, None
             for iteration in range(self.MAX_ITERATIONS):
-                is_valid, errors = self.evaluate_message(message)
+                # After the first round only the fields the optimizer changed are re-sent
+                verdict = await self.aevaluate_message(message, patch, errors)
+                if verdict is None:
+                    logger.error(f"  [{message_id}] Error during evaluation: evaluator returned no verdict")
+                    self._mark_evaluation_failed(message)
+                    break
+                is_valid, errors = verdict
 
                 if is_valid:
-                    print(f"  ✓ Message valid after {iteration} iteration(s)")
+                    logger.info(f"  [{message_id}] ✓ Message valid after {iteration} iteration(s)")
                     message['validation_status'] = 'VALID'
                     message['validation_errors'] = []
                     break
                 else:
-                    print(f"  Iteration {iteration + 1}: Found {len(errors)} error(s)")
+                    logger.info(f"  [{message_id}] Iteration {iteration + 1}: Found {len(errors)} error(s)")
                     for error in errors[:3]:  # Show first 3 errors
-                        print(f"    - {error}")
+                        logger.info(f"    - {error}")
+
+                    if prev_error_count is not None and len(errors) >= prev_error_count:
+                        # The last correction did not reduce the errors; further rounds rarely help
+                        logger.info(f"  [{message_id}] ✗ No progress since last iteration. Message still has errors.")
+                        message['validation_status'] = 'INVALID'
+                        message['validation_errors'] = errors
+                        break
+                    prev_error_count = len(errors)
 
                     if iteration < self.MAX_ITERATIONS - 1:
                         # Attempt to optimize
-                        print(f"  Attempting optimization...")
-                        message = self.optimize_message(message, errors)
+                        logger.info(f"  [{message_id}] Attempting optimization...")
+                        before = dict(message)
+                        try:
+                            message = await self.aoptimize_message(message, errors)
+                        except Exception as e:
+                            # Any failure, including odd LLM output, only fails this message
+                            logger.error(f"  [{message_id}] Error during optimization: {e}")
+                            self.correction_failures += 1
+                            # Drop any fields a half-applied correction already changed
+                            message.clear()
+                            message.update(before)
+                            message['validation_status'] = 'INVALID'
+                            message['validation_errors'] = errors
+                            break
+                        patch = self._diff_fields(before, message)
+                        if not patch:
+                            # Re-evaluating an unchanged message would return the same errors
+                            logger.info(f"  [{message_id}] ✗ Optimization made no changes. Message still has errors.")
+                            message['validation_status'] = 'INVALID'
+                            message['validation_errors'] = errors
+                            break
                     else:
                         # Max iterations reached
-                        print(f"  ✗ Max iterations reached. Message still has errors.")
+                        logger.info(f"  [{message_id}] ✗ Max iterations reached. Message still has errors.")
                         message['validation_status'] = 'INVALID'
                         message['validation_errors'] = errors
 
-            optimized_messages.append(message)
+            return message
+
+    async def _process_all(self, messages: List[Dict]) -> List[Dict]:
+        """
+        Process all messages concurrently, bounded by TOOL_CONCURRENCY_LIMIT.
+
+        Args:
+            messages: List of SWIFT messages to process
+
+        Returns:
+            List of validated and optimized messages, in input order
+        """
+        semaphore = asyncio.Semaphore(self.config.TOOL_CONCURRENCY_LIMIT)
+        return await asyncio.gather(*(
+            self._process_one(i, message, len(messages), semaphore)
+            for i, message in enumerate(messages)
+        ))
+
+    def _process_all_batched(self, messages: List[Dict]) -> List[Dict]:
+        """
+        Process all messages in rounds, one Batch API job per step and round.
+
+        Each round evaluates every unfinished message in one batch job and
+        corrects the ones that still have errors in another, following the
+        same rules as _process_one.
+
+        Args:
+            messages: List of SWIFT messages to process
+
+        Returns:
+            List of validated and optimized messages, in input order
+        """
+        messages = [m.model_dump() if hasattr(m, "model_dump") else m for m in messages]
+        # Per message: [errors, patch, prev_error_count]
+        state = [[None, None, None] for _ in messages]
+        pending = list(range(len(messages)))
+
+        def mark_invalid(index: int, errors: List[str]) -> None:
+            messages[index]['validation_status'] = 'INVALID'
+            messages[index]['validation_errors'] = errors
+
+        for iteration in range(self.MAX_ITERATIONS):
+            if not pending:
+                break
+            logger.info(f"\nRound {iteration + 1}: evaluating {len(pending)} message(s)")
+
+            # Cached verdicts are reused; the rest go out as one batch job
+            verdicts = {}
+            misses = []
+            for index in pending:
+                key = self._message_key(messages[index])
+                cached = self._get_cached_evaluation(key)
+                if cached is not None:
+                    verdicts[index] = cached
+                else:
+                    misses.append((index, key))
+            if misses:
+                results = self.evaluator_agent.evaluate_batch(
+                    [messages[index] for index, _ in misses],
+                    [state[index][1] for index, _ in misses],
+                    [state[index][0] for index, _ in misses]
+                )
+                for (index, key), result in zip(misses, results):
+                    # evaluate_batch sends a patch prompt under the same condition
+                    partial = bool(state[index][1]) and state[index][0] is not None
+                    verdict = self._verdict(key, result, partial)
+                    if verdict is None:
+                        logger.error(f"  [{messages[index].get('message_id', 'Unknown')}] "
+                                     f"Error during evaluation: evaluator returned no verdict")
+                        self._mark_evaluation_failed(messages[index])
+                    else:
+                        verdicts[index] = verdict
+
+            to_optimize = []
+            for index in pending:
+                if index not in verdicts:
+                    continue
+                message = messages[index]
+                message_id = message.get('message_id', 'Unknown')
+                is_valid, errors = verdicts[index]
+                state[index][0] = errors
+
+                if is_valid:
+                    logger.info(f"  [{message_id}] ✓ Message valid after {iteration} iteration(s)")
+                    message['validation_status'] = 'VALID'
+                    message['validation_errors'] = []
+                    continue
+
+                logger.info(f"  [{message_id}] Iteration {iteration + 1}: Found {len(errors)} error(s)")
+                for error in errors[:3]:  # Show first 3 errors
+                    logger.info(f"    - {error}")
+
+                prev_error_count = state[index][2]
+                if prev_error_count is not None and len(errors) >= prev_error_count:
+                    logger.info(f"  [{message_id}] ✗ No progress since last iteration. Message still has errors.")
+                    mark_invalid(index, errors)
+                elif iteration < self.MAX_ITERATIONS - 1:
+                    state[index][2] = len(errors)
+                    to_optimize.append(index)
+                else:
+                    logger.info(f"  [{message_id}] ✗ Max iterations reached. Message still has errors.")
+                    mark_invalid(index, errors)
+
+            pending = []
+            if not to_optimize:
+                continue
+
+            logger.info(f"Round {iteration + 1}: correcting {len(to_optimize)} message(s)")
+            try:
+                corrections = self.correction_agent.respond_batch(
+                    [messages[index] for index in to_optimize],
+                    [state[index][0] for index in to_optimize]
+                )
+            except Exception as e:
+                logger.error(f"Error during batch optimization: {e}")
+                self.correction_failures += len(to_optimize)
+                for index in to_optimize:
+                    mark_invalid(index, state[index][0])
+                continue
+
+            for index, corrected in zip(to_optimize, corrections):
+                message = messages[index]
+                message_id = message.get('message_id', 'Unknown')
+                errors = state[index][0]
+                if corrected is None:
+                    logger.error(f"  [{message_id}] Error during optimization: correction request failed")
+                    self.correction_failures += 1
+                    mark_invalid(index, errors)
+                    continue
+                before = dict(message)
+                try:
+                    self._apply_correction(message, errors, corrected)
+                except Exception as e:
+                    logger.error(f"  [{message_id}] Error during optimization: {e}")
+                    self.correction_failures += 1
+                    # Drop any fields a half-applied correction already changed
+                    message.clear()
+                    message.update(before)
+                    mark_invalid(index, errors)
+                    continue
+                patch = self._diff_fields(before, message)
+                if not patch:
+                    logger.info(f"  [{message_id}] ✗ Optimization made no changes. Message still has errors.")
+                    mark_invalid(index, errors)
+                    continue
+                state[index][1] = patch
+                pending.append(index)
+
+        return messages
+
+    def process_with_evaluator_optimizer(self, messages: List[Dict]) -> List[Dict]:
+        """
+        Process messages through the evaluator-optimizer pattern.
+
+        Messages are processed concurrently; each one still runs its own
+        sequential evaluate/optimize loop. With Config.USE_BATCH_API the
+        messages instead advance in lockstep rounds of Batch API jobs.
+
+        Args:
+            messages: List of SWIFT messages to process
+
+        Returns:
+            List of validated and optimized messages
+        """
+        return asyncio.run(self.aprocess_with_evaluator_optimizer(messages))
+
+    async def aprocess_with_evaluator_optimizer(self, messages: List[Dict]) -> List[Dict]:
+        """
+        Async variant of process_with_evaluator_optimizer, for callers already
+        running an event loop.
+
+        Args:
+            messages: List of SWIFT messages to process
+
+        Returns:
+            List of validated and optimized messages
+        """
+        logger.info("=" * 60)
+        logger.info("EVALUATOR-OPTIMIZER PATTERN PROCESSING")
+        logger.info("=" * 60)
+
+        self.correction_failures = 0
+        self.evaluation_failures = 0
+        if self.config.USE_BATCH_API:
+            # Batch jobs are polled with blocking calls, so keep them off the loop
+            optimized_messages = await asyncio.to_thread(self._process_all_batched, messages)
+        else:
+            optimized_messages = await self._process_all(messages)
 
         # Print summary
         valid_count = sum(1 for m in optimized_messages if m.get('validation_status') == 'VALID')
-        print(f"\n{'=' * 60}")
-        print(f"EVALUATOR-OPTIMIZER SUMMARY")
-        print(f"{'=' * 60}")
-        print(f"Total messages processed: {len(optimized_messages)}")
-        print(f"Valid messages: {valid_count}")
-        print(f"Invalid messages: {len(optimized_messages) - valid_count}")
+        logger.info(f"\n{'=' * 60}")
+        logger.info(f"EVALUATOR-OPTIMIZER SUMMARY")
+        logger.info(f"{'=' * 60}")
+        logger.info(f"Total messages processed: {len(optimized_messages)}")
+        logger.info(f"Valid messages: {valid_count}")
+        logger.info(f"Invalid messages: {len(optimized_messages) - valid_count}")
+        logger.info(f"Failed corrections: {self.correction_failures}")
+        logger.info(f"Failed evaluations: {self.evaluation_failures}")
 
         return optimized_messages
 
@@ -220,19 +602,56 @@ class EvaluatorOptimizerPattern:
             }
         ]
 
-        print("Testing Evaluator-Optimizer Pattern\n")
+        logger.info("Testing Evaluator-Optimizer Pattern\n")
         results = self.process_with_evaluator_optimizer(test_messages)
 
-        print("\nTest Results:")
+        logger.info("\nTest Results:")
         for msg in results:
-            print(f"\n{msg.get('message_id')}:")
-            print(f"  Status: {msg.get('validation_status')}")
+            logger.info(f"\n{msg.get('message_id')}:")
+            logger.info(f"  Status: {msg.get('validation_status')}")
             if msg.get('validation_errors'):
-                print(f"  Remaining errors: {len(msg.get('validation_errors'))}")
+                logger.info(f"  Remaining errors: {len(msg.get('validation_errors'))}")
 
         return results
 
 
+# Ways evaluator errors refer to each field; amount and currency share the :32A: block
+_ERROR_FIELD_ALIASES = {
+    "message_type": ("message_type",), "message type": ("message_type",),
+    "reference": ("reference",), ":20:": ("reference",),
+    "amount": ("amount",), ":32a:": ("amount", "currency", "value_date"),
+    "currency": ("currency", "amount"), "currencies": ("currency", "amount"),
+    "sender_bic": ("sender_bic",), "sender bic": ("sender_bic",), "sender": ("sender_bic",),
+    "receiver_bic": ("receiver_bic",), "receiver bic": ("receiver_bic",), "receiver": ("receiver_bic",),
+    "bic": ("sender_bic", "receiver_bic"), "bics": ("sender_bic", "receiver_bic"),
+    "value_date": ("value_date",), "value date": ("value_date",), "date": ("value_date",),
+    "ordering_customer": ("ordering_customer",), "ordering customer": ("ordering_customer",),
+    "beneficiary": ("beneficiary",),
+    "remittance_info": ("remittance_info",), "remittance": ("remittance_info",),
+}
+_ERROR_FIELD_RE = re.compile(
+    r"(?<![\w])(?:" + "|".join(
+        re.escape(alias) for alias in sorted(_ERROR_FIELD_ALIASES, key=len, reverse=True)
+    ) + r")(?![\w])",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_error_fields(error: str) -> frozenset:
+    """Map one validation error to the message fields it names."""
+    fields = set()
+    for alias in _ERROR_FIELD_RE.findall(error):
+        fields.update(_ERROR_FIELD_ALIASES[alias.lower()])
+    return frozenset(fields)
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_bic(bic: str) -> bool:
+    """Match a BIC against the compiled pattern; BICs repeat heavily across a batch."""
+    return EvaluatorOptimizerPattern._BIC_RE.fullmatch(bic) is not None
+
+
 if __name__ == "__main__":
     # Test the evaluator-optimizer pattern
     pattern = EvaluatorOptimizerPattern()
@@ -5,10 +5,150 @@ This module implements the orchestrator-worker pattern where an orchestrator
 breaks down work into tasks that are executed by generic workers.
 """
 
+import hashlib
 import json
-from typing import Dict, List, Any
-from openai import OpenAI
-from config import Config
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Final, Iterator, List, Tuple
+
+import orjson
+from config import CONFIG
+from services.llm_service import get_openai_client
+from services.log_service import get_logger
+from services.serialization import dumps
+
+logger = get_logger(__name__)
+
+
+class _TaskStreamParser:
+    """
+    Incrementally extracts complete task objects from a streamed orchestrator
+    response of the form {"analysis": ..., "tasks": [{...}, {...}]}.
+    """
+
+    # The tasks key itself, not an escaped mention inside a string value
+    _TASKS_START = re.compile(r'(?<!\\)"tasks"\s*:\s*\[')
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = None  # Position inside the tasks array, once found
+        self._done = False
+        # Array elements decoded so far, including non-dict ones that were skipped
+        self.parsed_count = 0
+
+    def feed(self, text: str) -> List[Dict]:
+        """Add streamed text and return the tasks completed by it."""
+        self._buffer += text
+        tasks = []
+        if self._done:
+            return tasks
+
+        if self._pos is None:
+            match = self._TASKS_START.search(self._buffer)
+            if match is None:
+                return tasks
+            self._pos = match.end()
+
+        buffer = self._buffer
+        while True:
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            self._pos = pos
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._done = True
+                break
+            try:
+                task, self._pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Incomplete task, wait for more text
+            self.parsed_count += 1
+            if isinstance(task, dict):
+                tasks.append(task)
+
+        return tasks
+
+
+class _TaskBatcher:
+    """
+    Collects tasks of the same type submitted within a short window and
+    executes them as one batch.
+
+    The first task of a type opens a window of flush_timeout seconds; the
+    batch is flushed when the window closes or max_batch_size is reached.
+    A task submitted while no other task is outstanding runs at once, as
+    nothing is in flight that suggests more tasks are about to arrive.
+    """
+
+    def __init__(self, execute_batch: Callable[[List[Dict]], List[Dict]],
+                 flush_timeout: float, max_batch_size: int, max_inflight_batches: int):
+        self._execute_batch = execute_batch
+        self._flush_timeout = flush_timeout
+        self._max_batch_size = max_batch_size
+        self._inflight = threading.BoundedSemaphore(max_inflight_batches)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Tuple[Dict, Future]]] = {}
+        self._outstanding = 0  # Tasks submitted whose batch has not finished
+
+    def submit(self, task: Dict) -> Future:
+        """Queue a task and return a future for its result."""
+        future = Future()
+        task_type = task.get('type', 'unknown')
+
+        with self._lock:
+            idle = self._outstanding == 0
+            self._outstanding += 1
+            if idle:
+                batch = [(task, future)]
+                flush_now = True
+            else:
+                batch = self._pending.setdefault(task_type, [])
+                batch.append((task, future))
+                if len(batch) == 1:
+                    timer = threading.Timer(self._flush_timeout, self._flush, args=(task_type, batch))
+                    timer.daemon = True
+                    timer.start()
+                flush_now = len(batch) >= self._max_batch_size
+                if flush_now:
+                    del self._pending[task_type]
+
+        if flush_now:
+            self._run(batch)
+        return future
+
+    def _flush(self, task_type: str, batch: List[Tuple[Dict, Future]]):
+        """Flush a batch when its window closes, unless it was already flushed."""
+        with self._lock:
+            if self._pending.get(task_type) is not batch:
+                return
+            del self._pending[task_type]
+        self._run(batch)
+
+    def _run(self, batch: List[Tuple[Dict, Future]]):
+        """Execute a batch and resolve its futures."""
+        error = None
+        with self._inflight:
+            try:
+                results = self._execute_batch([task for task, _ in batch])
+            except Exception as e:
+                error = e
+
+        # Settle the count first, so a caller that resubmits on wake-up sees it
+        with self._lock:
+            self._outstanding -= len(batch)
+
+        if error is not None:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
 
 
 class OrchestratorWorkerPattern:
@@ -17,10 +157,36 @@ class OrchestratorWorkerPattern:
     The orchestrator analyzes messages and creates tasks for generic workers.
     """
 
+    # Batches this small skip the orchestrator LLM call and use the standard plan below
+    SMALL_BATCH_THRESHOLD = 2
+
+    # (type, description, priority, message fields passed to the worker)
+    _SMALL_BATCH_TEMPLATE = (
+        (
+            "compliance_check",
+            "Check sender and receiver BICs and message fields for regulatory compliance",
+            "high",
+            ("message_id", "message_type", "reference", "sender_bic", "receiver_bic")
+        ),
+        (
+            "fraud_analysis",
+            "Investigate the transactions for fraud indicators",
+            "high",
+            ("message_id", "amount", "sender_bic", "receiver_bic", "remittance_info",
+             "fraud_status", "fraud_score", "fraud_reasons")
+        ),
+        (
+            "amount_verification",
+            "Verify transaction amounts and currencies",
+            "medium",
+            ("message_id", "amount", "currency")
+        ),
+    )
+
     def __init__(self):
         """Initialize the orchestrator-worker pattern."""
-        self.config = Config()
-        self.client = OpenAI(api_key=self.config.OPENAI_API_KEY)
+        self.config = CONFIG
+        self.client = get_openai_client()
         self.model = "gpt-4o"
     
 
@@ -65,26 +231,19 @@ class OrchestratorWorkerPattern:
         what tasks need to be performed.
         """
 
-        def __init__(self):
-            """Initialize the Orchestrator."""
+        def __init__(self, log_prefix: str = ""):
+            """
+            Initialize the Orchestrator.
+
+            Args:
+                log_prefix: Prepended to log lines, to tell concurrent runs apart
+            """
             # Initialize OpenAI client
             # Set up any configuration needed
-            self.client = OpenAI()
+            self.client = get_openai_client()
             self.model = "gpt-4o"
-
-        def _make_json_safe(self, obj):
-            """
-            Convert non-JSON-serializable objects (e.g. datetime)
-            into safe string representations for LLM prompts.
-            """
-            if isinstance(obj, dict):
-                return {k: self._make_json_safe(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [self._make_json_safe(v) for v in obj]
-            elif hasattr(obj, "isoformat"):
-                return obj.isoformat()
-            else:
-                return obj
+            self.last_response: Dict = {}
+            self.log_prefix = log_prefix
 
         def analyze_and_create_tasks(self, messages: List[Dict]) -> Dict:
             """
@@ -122,6 +281,24 @@ class OrchestratorWorkerPattern:
                 ]
             }
             """
+            for _ in self.stream_tasks(messages):
+                pass
+            return self.last_response
+
+        def stream_tasks(self, messages: List[Dict]) -> Iterator[Dict]:
+            """
+            Stream the orchestrator response and yield each task as soon as
+            it is complete, so workers can start before the response ends.
+
+            Args:
+                messages: List of SWIFT messages to analyze
+
+            Yields:
+                Task dictionaries, in the order the orchestrator emits them
+
+            After the generator is exhausted, self.last_response holds the full
+            response in the analyze_and_create_tasks format.
+            """
             # Create system prompt for orchestrator
             system_prompt = """You are an Orchestrator for SWIFT transaction processing.
             Analyze the provided messages and create specific tasks for workers.
@@ -136,50 +313,60 @@ class OrchestratorWorkerPattern:
             Return JSON with your analysis and a list of specific tasks."""
 
             # Create user prompt with messages
-            messages = self._make_json_safe(messages)
-
-            user_prompt = f"""Analyze these SWIFT messages and create processing tasks:
-
-            {json.dumps(messages, indent=2)}
-
-            Return JSON with structure:
-            {{
-                "analysis": "Your analysis of the message batch",
-                "task_count": number,
-                "tasks": [
-                    {{
-                        "task_id": "unique_id",
-                        "type": "task_type",
-                        "description": "What needs to be done",
-                        "priority": "high|medium|low",
-                        "data": "relevant data for the task"
-                    }}
-                ]
-            }}"""
+            user_prompt = (
+                "Analyze these SWIFT messages and create processing tasks:\n"
+                f"{dumps(messages)}\n"
+                "Return JSON with structure:\n"
+                '{"analysis":"Your analysis of the message batch","task_count":number,'
+                '"tasks":[{"task_id":"unique_id","type":"task_type",'
+                '"description":"What needs to be done","priority":"high|medium|low",'
+                '"data":"relevant data for the task"}]}'
+            )
 
             # TODO: Call the LLM and return the response
             # Use self.client.chat.completions.create()
             # Don't forget response_format={"type": "json_object"}
 
+            parser = _TaskStreamParser()
+            chunks = []
+            streamed = []
             try:
-                response = self.client.chat.completions.create(
+                stream = self.client.chat.completions.create(
                     model=self.model,
                     messages=[
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": user_prompt}
                     ],
                     response_format={"type": "json_object"},
-                    temperature=0.1
+                    temperature=0.1,
+                    stream=True
                 )
-                return json.loads(response.choices[0].message.content or "{}")
+                for chunk in stream:
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    text = chunk.choices[0].delta.content
+                    chunks.append(text)
+                    for task in parser.feed(text):
+                        streamed.append(task)
+                        yield task
+
+                response = orjson.loads("".join(chunks) or "{}")
             except Exception as e:
-                print(f"Orchestrator error: {e}")
-                return {
+                logger.error(f"{self.log_prefix}Orchestrator error: {e}")
+                response = {
                     "analysis": "Failed to create tasks",
-                    "task_count": 0,
-                    "tasks": []
+                    "task_count": len(streamed),
+                    "tasks": streamed
                 }
 
+            self.last_response = response
+
+            # Anything the incremental parser could not pick up is dispatched last;
+            # skip by array position, as skipped non-dict entries still take one
+            for task in response.get("tasks", [])[parser.parsed_count:]:
+                if isinstance(task, dict):
+                    yield task
+
     class GenericAgent:
         """
         Generic worker agent that executes tasks assigned by the orchestrator.
@@ -188,31 +375,55 @@ class OrchestratorWorkerPattern:
         and execute them accordingly.
         """
 
-        def __init__(self):
-            """Initialize the Generic Agent."""
+        # Completed results shared by all agents, keyed by (task type, prompt digest)
+        RESULT_CACHE_SIZE = 1024
+        _result_cache: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        _result_cache_lock = threading.Lock()
+
+        _SYSTEM_PROMPTS: Final[Dict[str, str]] = {
+            "compliance_check": "You are a Compliance Specialist.\nExecute the compliance check as described.",
+            "fraud_analysis": "You are a Fraud Analyst.\nPerform detailed fraud analysis as requested.",
+            "amount_verification": "You are a Financial Auditor.\nVerify and analyze the amounts as specified.",
+            "pattern_detection": "You are a Pattern Analysis Expert.\nDetect and report unusual patterns.",
+            "summary_report": "You are a Report Generator.\nCreate the requested summary report.",
+        }
+        _DEFAULT_PROMPT: Final[str] = "You are a Generic Processing Agent.\nComplete the assigned task."
+
+        # System messages are identical for every task of a type; build them once
+        _SYSTEM_MESSAGES: Final[Dict[str, Dict[str, str]]] = {
+            task_type: {"role": "system", "content": prompt}
+            for task_type, prompt in _SYSTEM_PROMPTS.items()
+        }
+        _DEFAULT_SYSTEM_MESSAGE: Final[Dict[str, str]] = {"role": "system", "content": _DEFAULT_PROMPT}
+
+        def __init__(self, flush_timeout_ms: int = 50, max_batch_size: int = 8,
+                     max_inflight_batches: int = 4):
+            """
+            Initialize the Generic Agent.
+
+            Args:
+                flush_timeout_ms: How long to wait for more tasks of the same type
+                max_batch_size: Maximum number of tasks packed into one LLM call
+                max_inflight_batches: Maximum number of batches executing at once
+            """
             # Initialize OpenAI client
             # Set up any configuration needed
-            self.client = OpenAI()
+            self.client = get_openai_client()
             self.model = "gpt-4o"
-            
-        def _make_json_safe(self, obj):
-            """
-            Convert non-JSON-serializable objects (e.g. datetime)
-            into safe string representations for LLM prompts.
-            """
-            if isinstance(obj, dict):
-                return {k: self._make_json_safe(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [self._make_json_safe(v) for v in obj]
-            elif hasattr(obj, "isoformat"):
-                return obj.isoformat()
-            else:
-                return obj
+            self._batcher = _TaskBatcher(
+                self._execute_batch,
+                flush_timeout=flush_timeout_ms / 1000,
+                max_batch_size=max_batch_size,
+                max_inflight_batches=max_inflight_batches
+            )
 
         def execute_task(self, task: Dict) -> Dict:
             """
             Execute a task assigned by the orchestrator.
 
+            Tasks of the same type submitted within the flush window are
+            executed together in a single LLM call.
+
             Args:
                 task: Task dictionary with type, description, and data
 
@@ -222,55 +433,140 @@ class OrchestratorWorkerPattern:
             HINT: Based on the task type, create appropriate prompts
             and execute the task using the LLM.
             """
-            task_type = task.get('type', 'unknown')
-            description = task.get('description', '')
-            task_data = task.get('data', {})
+            key = self._cache_key(task)
+            with self._result_cache_lock:
+                cached = self._result_cache.get(key)
+                if cached is not None:
+                    self._result_cache.move_to_end(key)
+            if cached is not None:
+                return {**cached, "task_id": task.get("task_id")}
+
+            result = self._batcher.submit(task).result()
+
+            if result.get("status") == "completed":
+                with self._result_cache_lock:
+                    self._result_cache[key] = result
+                    if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                        self._result_cache.popitem(last=False)
+            return result
+
+        @staticmethod
+        def _cache_key(task: Dict) -> Tuple[str, str]:
+            """
+            Key a task by its type and a digest of everything its prompt is built
+            from: description and data. Tasks that differ only in task_id or
+            priority share a result.
+            """
+            canonical = dumps(
+                [task.get("description", ""), task.get("data", {})], orjson.OPT_SORT_KEYS
+            )
+            return (
+                task.get("type", "unknown"),
+                hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+            )
+
+        @classmethod
+        def _system_message(cls, task_type: str) -> Dict[str, str]:
+            """Look up the prebuilt system message for a task type."""
+            return cls._SYSTEM_MESSAGES.get(task_type, cls._DEFAULT_SYSTEM_MESSAGE)
+
+        def _execute_batch(self, tasks: List[Dict]) -> List[Dict]:
+            """
+            Execute tasks of the same type with one LLM call.
 
-            # Create prompts based on task type
-            if task_type == 'compliance_check':
-                system_prompt = """You are a Compliance Specialist.
-                Execute the compliance check as described."""
-            elif task_type == 'fraud_analysis':
-                system_prompt = """You are a Fraud Analyst.
-                Perform detailed fraud analysis as requested."""
-            elif task_type == 'amount_verification':
-                system_prompt = """You are a Financial Auditor.
-                Verify and analyze the amounts as specified."""
-            elif task_type == 'pattern_detection':
-                system_prompt = """You are a Pattern Analysis Expert.
-                Detect and report unusual patterns."""
-            elif task_type == 'summary_report':
-                system_prompt = """You are a Report Generator.
-                Create the requested summary report."""
-            else:
-                system_prompt = """You are a Generic Processing Agent.
-                Complete the assigned task."""
+            Args:
+                tasks: Tasks sharing the same type
 
-            task_data = self._make_json_safe(task_data)
+            Returns:
+                List of task results, in the same order as tasks
+            """
+            if len(tasks) == 1:
+                return [self._execute_single(tasks[0])]
 
-            user_prompt = f"""Execute this task:
-            Type: {task_type}
-            Description: {description}
-            Data: {json.dumps(task_data, indent=2)}
+            task_type = tasks[0].get('type', 'unknown')
+            batch = [
+                {
+                    "task_id": task.get("task_id"),
+                    "description": task.get("description", ""),
+                    "data": task.get("data", {})
+                }
+                for task in tasks
+            ]
 
-            Return your results in JSON format."""
+            user_prompt = (
+                f"Execute these {len(tasks)} tasks of type {task_type}:\n"
+                f"{dumps(batch)}\n"
+                "Return JSON with structure:\n"
+                '{"results":["one result object per task, in the same order as the tasks"]}'
+            )
 
-            # TODO: Call the LLM and return the response
-            # Use appropriate error handling
-            # YOUR CODE ENDS HERE
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        self._system_message(task_type),
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=0.1
+                )
+
+                results = orjson.loads(response.choices[0].message.content or "{}").get("results")
+            except Exception as e:
+                return [
+                    {
+                        "task_id": task.get("task_id"),
+                        "status": "failed",
+                        "error": str(e)
+                    }
+                    for task in tasks
+                ]
+
+            if not isinstance(results, list) or len(results) != len(tasks):
+                # The batch answer cannot be matched to tasks; run them one by one
+                return [self._execute_single(task) for task in tasks]
+
+            return [
+                {
+                    "task_id": task.get("task_id"),
+                    "status": "completed",
+                    "results": result
+                }
+                for task, result in zip(tasks, results)
+            ]
+
+        def _execute_single(self, task: Dict) -> Dict:
+            """
+            Execute one task with its own LLM call.
+
+            Args:
+                task: Task dictionary with type, description, and data
+
+            Returns:
+                Dictionary with task results
+            """
+            task_type = task.get('type', 'unknown')
+            description = task.get('description', '')
+            task_data = task.get('data', {})
+
+            user_prompt = (
+                f"Execute this task:\nType: {task_type}\nDescription: {description}\n"
+                f"Data: {dumps(task_data)}\n"
+                "Return your results in JSON format."
+            )
 
             try:
                 response = self.client.chat.completions.create(
                     model=self.model,
                     messages=[
-                        {"role": "system", "content": system_prompt},
+                        self._system_message(task_type),
                         {"role": "user", "content": user_prompt}
                     ],
                     response_format={"type": "json_object"},
                     temperature=0.1
                 )
 
-                result = json.loads(response.choices[0].message.content or "{}")
+                result = orjson.loads(response.choices[0].message.content or "{}")
 
                 return {
                     "task_id": task.get("task_id"),
@@ -286,12 +582,48 @@ class OrchestratorWorkerPattern:
                 }
 
 
-    def process_with_orchestrator(self, messages: List[Dict]) -> Dict:
+    def _local_task_plan(self, messages: List[Dict]) -> Dict:
+        """
+        Build the standard task plan locally instead of asking the orchestrator.
+
+        Args:
+            messages: List of SWIFT messages to process
+
+        Returns:
+            Dictionary in the same shape as Orchestrator.analyze_and_create_tasks
+        """
+        tasks = []
+        if messages:
+            for i, (task_type, description, priority, fields) in enumerate(self._SMALL_BATCH_TEMPLATE, 1):
+                tasks.append({
+                    "task_id": f"task_{i:03d}",
+                    "type": task_type,
+                    "description": description,
+                    "priority": priority,
+                    "data": {
+                        "messages": [
+                            {field: message[field] for field in fields if field in message}
+                            for message in messages
+                        ]
+                    }
+                })
+
+        return {
+            "analysis": "small batch fast-path",
+            "task_count": len(tasks),
+            "tasks": tasks
+        }
+
+    def process_with_orchestrator(self, messages: List[Dict], run_name: str = None) -> Dict:
         """
         Process messages using the orchestrator-worker pattern.
 
+        Safe to call from several threads at once; each call builds its own
+        orchestrator and worker agent.
+
         Args:
             messages: List of SWIFT messages to process
+            run_name: Tags this run's log lines, to tell concurrent runs apart
 
         Returns:
             Processing results from the orchestrator-worker system
@@ -305,39 +637,62 @@ class OrchestratorWorkerPattern:
         5. Collect and return all results
         6. Print a summary of what was accomplished
         """
-        print("=" * 60)
-        print("ORCHESTRATOR-WORKER PATTERN PROCESSING")
-        print("=" * 60)
-
-
-        # Step 1: Create orchestrator
-        orchestrator = self.Orchestrator()
+        prefix = f"[{run_name}] " if run_name else ""
+        logger.info(prefix + "=" * 60)
+        logger.info(f"{prefix}ORCHESTRATOR-WORKER PATTERN PROCESSING")
+        logger.info(prefix + "=" * 60)
 
-        # Step 2: Get tasks from orchestrator
-        print("Orchestrator analyzing messages...")
-        orchestrator_response = orchestrator.analyze_and_create_tasks(messages)
 
-        print(f"Orchestrator Analysis: {orchestrator_response.get('analysis', 'No analysis')}")
-        print(f"Tasks created: {orchestrator_response.get('task_count', 0)}")
-
-        # Step 3: Create generic agent(s)
+        # Step 1: Create generic agent(s)
+        # A single agent is shared by all worker threads (the OpenAI client is thread-safe)
         agent = self.GenericAgent()
 
-        # Step 4: Execute tasks
-        results = []
-        tasks = orchestrator_response.get('tasks', [])
+        # Step 2 & 3: Get tasks, from the orchestrator unless the batch is small, and
+        # execute them concurrently as soon as each one is known
+        small_batch = len(messages) <= self.SMALL_BATCH_THRESHOLD
+        with ThreadPoolExecutor(max_workers=self.config.TOOL_CONCURRENCY_LIMIT) as executor:
+            futures = {}
 
-        for task in tasks:
-            print(f"Executing task: {task.get('task_id')} - {task.get('description')}")
-            result = agent.execute_task(task)
-            results.append(result)
-            print(f"Task {task.get('task_id')} completed")
+            if small_batch:
+                logger.info(f"{prefix}Small batch, using the standard task plan...")
+                orchestrator_response = self._local_task_plan(messages)
+                tasks = orchestrator_response.get('tasks', [])
+            else:
+                orchestrator = self.Orchestrator(prefix)
+                logger.info(f"{prefix}Orchestrator analyzing messages...")
+                tasks = orchestrator.stream_tasks(messages)
+
+            for task in tasks:
+                logger.info(f"{prefix}Executing task: {task.get('task_id')} - {task.get('description')}")
+                futures[executor.submit(agent.execute_task, task)] = (len(futures), task)
+
+            if not small_batch:
+                orchestrator_response = orchestrator.last_response
+
+            logger.info(f"{prefix}Orchestrator Analysis: {orchestrator_response.get('analysis', 'No analysis')}")
+            logger.info(f"{prefix}Tasks created: {orchestrator_response.get('task_count', 0)}")
+
+            # Step 4: Collect results as tasks finish
+            results = [None] * len(futures)
+            for future in as_completed(futures):
+                index, task = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Isolate failures so one task cannot poison the batch
+                    result = {
+                        "task_id": task.get("task_id"),
+                        "status": "failed",
+                        "error": str(e)
+                    }
+                results[index] = result
+                logger.info(f"{prefix}Task {task.get('task_id')} completed")
 
         # Step 5: Return results
         return {
             'orchestrator_analysis': orchestrator_response,
             'task_results': results,
-            'summary': f"Processed {len(tasks)} tasks for {len(messages)} messages"
+            'summary': f"Processed {len(results)} tasks for {len(messages)} messages"
         }
 
 
@@ -367,18 +722,18 @@ class OrchestratorWorkerPattern:
             }
         ]
 
-        print("Testing Orchestrator-Worker Pattern\n")
+        logger.info("Testing Orchestrator-Worker Pattern\n")
         results = self.process_with_orchestrator(test_messages)
 
-        print("\n" + "=" * 60)
-        print("TEST RESULTS SUMMARY")
-        print("=" * 60)
+        logger.info("\n" + "=" * 60)
+        logger.info("TEST RESULTS SUMMARY")
+        logger.info("=" * 60)
 
         if results:
-            print(f"Results obtained: {type(results)}")
+            logger.info(f"Results obtained: {type(results)}")
             if isinstance(results, dict):
                 for key, value in results.items():
-                    print(f"{key}: {value if not isinstance(value, list) else f'{len(value)} items'}")
+                    logger.info(f"{key}: {value if not isinstance(value, list) else f'{len(value)} items'}")
 
         return results
 
@@ -393,7 +748,7 @@ class TestHelper:
     @staticmethod
     def test_orchestrator_only():
         """Test just the Orchestrator class."""
-        print("Testing Orchestrator in isolation...")
+        logger.info("Testing Orchestrator in isolation...")
         # Create an instance of the Orchestrator
         # Test with sample messages
         # Print the tasks it creates
@@ -402,7 +757,7 @@ class TestHelper:
     @staticmethod
     def test_generic_agent_only():
         """Test just the GenericAgent class."""
-        print("Testing GenericAgent in isolation...")
+        logger.info("Testing GenericAgent in isolation...")
         sample_task = {
             'task_id': 'test_001',
             'type': 'compliance_check',
@@ -1,68 +1,264 @@
 """
-Parallelization Pattern for Concurrent Fraud Detection
+Parallelization Pattern for Batched Fraud Detection
 
-This module implements parallel fraud detection using multiple agents.
+This module implements batched fraud detection using multiple agents.
 You will add a third fraud detection agent and implement aggregation.
 """
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Tuple
 import time
+import warnings
+
+import numpy as np
 from agents.workflow_agents.base_agents import (
     FraudAmountDetectionAgent,
     FraudPatternDetectionAgent,
-    FraudAggAgent
+    FraudAggAgent,
+    error_result,
+    fused_fraud_scan
 )
+from services.log_service import get_logger
+
+logger = get_logger(__name__)
+
+
+def _encode_countries(countries: List[str]) -> np.ndarray:
+    """
+    Pack 2-character country codes into uint16 values (first char << 8 | second char).
+
+    Codes with characters outside Latin-1 do not fit in 16 bits and become 0,
+    which never matches a real country code.
+
+    Args:
+        countries: Country codes sliced from BICs (may be shorter than 2 chars)
+
+    Returns:
+        uint16 array of encoded country codes
+    """
+    try:
+        # BICs are ASCII in practice: one Latin-1 encode of the NUL-padded codes,
+        # read as big-endian uint16, yields every code without going through UCS-4
+        packed = "".join(country.ljust(2, "\0") for country in countries).encode("latin-1")
+    except UnicodeEncodeError:
+        chars = np.array(countries, dtype="<U2").view(np.uint32).reshape(-1, 2)
+        codes = (chars[:, 0] << 8) | chars[:, 1]
+        codes[(chars > 0xFF).any(axis=1)] = 0
+        return codes.astype(np.uint16)
+    return np.frombuffer(packed, dtype=">u2").astype(np.uint16)
+
+
+def _country_code(bic: str) -> int:
+    """
+    Pack the country code of a BIC (characters 5-6) into a uint16 value.
+
+    Returns 0, which never matches a country, for BICs that are too short or
+    whose country characters fall outside Latin-1.
+
+    Raises:
+        TypeError: If bic is not a string
+    """
+    if not isinstance(bic, str):
+        raise TypeError(f"BIC must be a string, not {type(bic).__name__}")
+    if len(bic) < 6:
+        return 0
+    first, second = ord(bic[4]), ord(bic[5])
+    if first > 0xFF or second > 0xFF:
+        return 0
+    return first << 8 | second
+
+
+def _country_bitmap(countries) -> bytearray:
+    """Build a 64KB bitmap with a 1 at the uint16 encoding of every given country."""
+    bitmap = bytearray(1 << 16)
+    for code in _encode_countries(sorted(countries)).tolist():
+        bitmap[code] = 1
+    return bitmap
+
 
 class GeographicRiskAgent:
     """
     Detect fraud based on high-risk country involvement inferred from BIC codes.
+
+    HIGH_RISK_COUNTRIES is fixed when the class is created, as the lookup
+    tables below are built from it once. A subclass that sets its own
+    countries must rebuild _HIGH_RISK_BITMAP and _HIGH_RISK_FLAGS too.
     """
 
-    HIGH_RISK_COUNTRIES = {"IR", "KP", "SY", "AF"}
+    __slots__ = ()
+
+    HIGH_RISK_COUNTRIES = frozenset({"IR", "KP", "SY", "AF"})
+    # HIGH_RISK_COUNTRIES indexed by uint16 country code: one byte read per lookup
+    _HIGH_RISK_BITMAP = _country_bitmap(HIGH_RISK_COUNTRIES)
+    _HIGH_RISK_FLAGS = np.frombuffer(bytes(_HIGH_RISK_BITMAP), dtype=np.uint8).astype(bool)
 
     def analyze(self, message: Dict) -> Dict:
         risk_score = 0.0
         fraud_reasons = []
 
-        sender_bic = message.get("sender_bic", "")
-        receiver_bic = message.get("receiver_bic", "")
-
-        try:
-            sender_country = sender_bic[4:6]
-            receiver_country = receiver_bic[4:6]
-
-            if sender_country in self.HIGH_RISK_COUNTRIES:
-                risk_score += 0.4
-                fraud_reasons.append(f"High-risk sender country: {sender_country}")
+        sender_bic = message.get("sender_bic") or ""
+        receiver_bic = message.get("receiver_bic") or ""
 
-            if receiver_country in self.HIGH_RISK_COUNTRIES:
-                risk_score += 0.4
-                fraud_reasons.append(f"High-risk receiver country: {receiver_country}")
+        high_risk = self._HIGH_RISK_BITMAP
+        if high_risk[_country_code(sender_bic)]:
+            risk_score += 0.4
+            fraud_reasons.append(f"High-risk sender country: {sender_bic[4:6]}")
 
-        except Exception:
-            pass
+        if high_risk[_country_code(receiver_bic)]:
+            risk_score += 0.4
+            fraud_reasons.append(f"High-risk receiver country: {receiver_bic[4:6]}")
 
         return {
             "agent": "GeographicRiskAgent",
-            "risk_score": min(risk_score, 1.0),
+            "risk_score": risk_score if risk_score < 1.0 else 1.0,
             "fraud_reasons": fraud_reasons
         }
 
+    def analyze_batch(self, messages: List[Dict]) -> List[Dict]:
+        """
+        Analyze a whole batch of messages in one vectorized pass.
+
+        Gives the same results as calling analyze on each message. Messages
+        with a BIC that is not a string are analyzed on their own, so they
+        only affect their own result.
+
+        Args:
+            messages: SWIFT messages to analyze
+
+        Returns:
+            Fraud analysis results, in message order
+        """
+        sender_countries = []
+        receiver_countries = []
+        bad_rows = {}
+        for index, message in enumerate(messages):
+            sender_bic = message.get("sender_bic") or ""
+            receiver_bic = message.get("receiver_bic") or ""
+            if not isinstance(sender_bic, str) or not isinstance(receiver_bic, str):
+                bad_rows[index] = self._analyze_row(message)
+                sender_bic = receiver_bic = ""
+            sender_countries.append(sender_bic[4:6])
+            receiver_countries.append(receiver_bic[4:6])
+
+        sender_flags = self._HIGH_RISK_FLAGS[_encode_countries(sender_countries)]
+        receiver_flags = self._HIGH_RISK_FLAGS[_encode_countries(receiver_countries)]
+        risk_scores = 0.4 * sender_flags
+        risk_scores += 0.4 * receiver_flags
+        np.minimum(risk_scores, 1.0, out=risk_scores)
+
+        results = []
+        for sender_country, receiver_country, sender_flag, receiver_flag, risk_score in zip(
+            sender_countries, receiver_countries,
+            sender_flags.tolist(), receiver_flags.tolist(), risk_scores.tolist()
+        ):
+            fraud_reasons = []
+            if sender_flag:
+                fraud_reasons.append(f"High-risk sender country: {sender_country}")
+            if receiver_flag:
+                fraud_reasons.append(f"High-risk receiver country: {receiver_country}")
+            results.append({
+                "agent": "GeographicRiskAgent",
+                "risk_score": risk_score,
+                "fraud_reasons": fraud_reasons
+            })
+        for index, result in bad_rows.items():
+            results[index] = result
+        return results
+
+    def _analyze_row(self, message: Dict) -> Dict:
+        """Analyze one message with analyze; an error result if that fails."""
+        try:
+            return self.analyze(message)
+        except Exception as e:
+            logger.error(f"Error in agent GeographicRiskAgent: {e}")
+            return error_result("GeographicRiskAgent", e)
+
+
+def _process_message(message: Dict, agent: Any) -> Dict:
+    """
+    Process a single message with a specific fraud detection agent.
+
+    Args:
+        message: SWIFT message to analyze
+        agent: Fraud detection agent to use
+
+    Returns:
+        Fraud analysis results from the agent
+    """
+    try:
+        # Call the agent's analyze method
+        result = agent.analyze(message)
+        result['message_id'] = message.get('message_id', 'unknown')
+        return result
+    except Exception as e:
+        logger.error(f"Error in agent {agent.__class__.__name__}: {e}")
+        return error_result(agent.__class__.__name__, e)
+
+
+def _process_batch(messages: List[Dict], agent: Any,
+                   analyze: Callable[[], List[Dict]] = None) -> List[Dict]:
+    """
+    Process a batch of messages with a fraud detection agent that supports analyze_batch.
+
+    Args:
+        messages: SWIFT messages to analyze
+        agent: Batch-capable fraud detection agent
+        analyze: Computes the agent's results for the batch; defaults to
+            agent.analyze_batch(messages)
+
+    Returns:
+        Fraud analysis results from the agent, in message order
+    """
+    try:
+        results = analyze() if analyze is not None else agent.analyze_batch(messages)
+    except Exception as e:
+        logger.error(f"Error in agent {agent.__class__.__name__}: {e}")
+        results = [error_result(agent.__class__.__name__, e) for _ in messages]
+    for message, result in zip(messages, results):
+        result['message_id'] = message.get('message_id', 'unknown')
+    return results
+
+
+def _process_fused_batch(messages: List[Dict], amount_agent: FraudAmountDetectionAgent,
+                         pattern_agent: FraudPatternDetectionAgent) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Run the amount and pattern agents on fields extracted in one shared pass.
+
+    Args:
+        messages: SWIFT messages to analyze
+        amount_agent: Amount-based fraud detection agent
+        pattern_agent: Pattern-based fraud detection agent
+
+    Returns:
+        Results of the amount agent and of the pattern agent, each in message order
+    """
+    amounts, sender_bics, receiver_bics, remittances = fused_fraud_scan(messages, amount_agent)
+    return (
+        _process_batch(messages, amount_agent, lambda: amount_agent.analyze_amounts(amounts)),
+        _process_batch(messages, pattern_agent,
+                       lambda: pattern_agent.analyze_fields(sender_bics, receiver_bics, remittances))
+    )
+
+
 class ParallelizationPattern:
     """
-    Implements parallel processing of fraud detection agents.
-    Multiple agents analyze messages concurrently for better performance.
+    Implements batch processing of fraud detection agents.
+    Each agent scores the whole batch at once, in vectorized passes run
+    one agent after another in this process.
     """
 
-    def __init__(self, max_workers: int = 8):
+    def __init__(self, max_workers: int = None):
         """
         Initialize the parallelization pattern.
 
         Args:
-            max_workers: Maximum number of concurrent threads
+            max_workers: Deprecated and ignored; agents no longer run in a worker pool
         """
-        self.max_workers = max_workers
+        if max_workers is not None:
+            warnings.warn(
+                "ParallelizationPattern(max_workers=...) is deprecated and ignored; "
+                "agents now score each batch in-process",
+                DeprecationWarning, stacklevel=2
+            )
 
         # Initialize fraud detection agents
         # TODO 10: Create third agent (10 points)
@@ -92,34 +288,12 @@ class ParallelizationPattern:
 
         ]
 
-    def _process_message(self, message: Dict, agent: Any) -> Dict:
-        """
-        Process a single message with a specific fraud detection agent.
-
-        Args:
-            message: SWIFT message to analyze
-            agent: Fraud detection agent to use
-
-        Returns:
-            Fraud analysis results from the agent
-        """
-        try:
-            # Call the agent's analyze method
-            result = agent.analyze(message)
-            result['message_id'] = message.get('message_id', 'unknown')
-            return result
-        except Exception as e:
-            print(f"Error in agent {agent.__class__.__name__}: {e}")
-            return {
-                'agent': agent.__class__.__name__,
-                'error': str(e),
-                'risk_score': 0,
-                'fraud_reasons': []
-            }
-
     def process_batch_parallel(self, messages: List[Dict]) -> List[Dict]:
         """
-        Process a batch of messages in parallel using all fraud detection agents.
+        Process a batch of messages with all fraud detection agents.
+
+        Each agent scores the whole batch at once; the agents run one after
+        another in this process.
 
         Args:
             messages: List of SWIFT messages to process
@@ -127,7 +301,8 @@ class ParallelizationPattern:
         Returns:
             List of messages with fraud detection results
         """
-        print(f"Processing {len(messages)} messages with {len(self.list_of_agents)} agents in parallel...")
+        agents = self.list_of_agents
+        logger.info(f"Processing {len(messages)} messages with {len(agents)} agents...")
         start_time = time.time()
 
         # TODO 11: Add aggregation agent (5 points)
@@ -143,78 +318,76 @@ class ParallelizationPattern:
 
         aggregator = FraudAggAgent()
 
-        # Process messages in parallel
+        # Score the batch with every agent
         processed_messages = []
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_msg = {}
-            for message in messages:
-                # Submit tasks for each agent to analyze this message
-                agent_futures = []
-                for agent in self.list_of_agents:
-                    future = executor.submit(self._process_message, message, agent)
-                    agent_futures.append(future)
-
-                future_to_msg[message['message_id']] = {
-                    'message': message,
-                    'futures': agent_futures
-                }
-
-            # Collect results
-            for msg_id, msg_data in future_to_msg.items():
-                message = msg_data['message']
-                agent_results = []
-
-                # Wait for all agents to complete for this message
-                for future in msg_data['futures']:
-                    try:
-                        result = future.result(timeout=5)
-                        agent_results.append(result)
-                    except Exception as e:
-                        print(f"Error getting result for message {msg_id}: {e}")
-
-                # TODO 12: Mark messages as fraudulent (5 points)
-                # INSTRUCTIONS:
-                # 1. Use the aggregator to combine results from all agents
-                # 2. Call aggregator.aggregate_results(agent_results)
-                # 3. Get the aggregated fraud assessment
-                # 4. Update the message with fraud information:
-                #    - Set message['fraud_status'] to "FRAUDULENT" or "CLEAN"
-                #    - Set message['fraud_score'] to the confidence score
-                #    - Set message['fraud_reasons'] to the aggregated reasons
-                #
-                # EXAMPLE:
-                # if aggregator:
-                #     aggregated = aggregator.aggregate_results(agent_results)
-                #     message['fraud_status'] = "FRAUDULENT" if aggregated['is_fraudulent'] else "CLEAN"
-                #     message['fraud_score'] = aggregated['confidence']
-                #     message['fraud_reasons'] = aggregated['aggregated_reasons']
-                # else:
-                #     message['fraud_status'] = "PENDING"
-                #     message['fraud_score'] = 0
-                #     message['fraud_reasons'] = []
-
-                # YOUR CODE HERE - Aggregate results and mark messages
-                aggregated = aggregator.aggregate_results(agent_results)
-
-                # For now, just store the raw results (remove after implementing TODO 12)
-                message['fraud_analysis'] = agent_results
-                message["fraud_status"] = (
-                    "FRAUDULENT" if aggregated["is_fraudulent"] else "CLEAN"
-                )
-                message["fraud_score"] = aggregated["confidence"]
-                message["fraud_reasons"] = aggregated["aggregated_reasons"]
-
-                processed_messages.append(message)
+        # Every agent scores the whole batch at once; the amount and pattern
+        # agents share a single pass over the message dicts
+        fused_results = {}
+        amount_agent = next((a for a in agents if isinstance(a, FraudAmountDetectionAgent)), None)
+        pattern_agent = next((a for a in agents if isinstance(a, FraudPatternDetectionAgent)), None)
+        if amount_agent is not None and pattern_agent is not None:
+            fused_results[id(amount_agent)], fused_results[id(pattern_agent)] = _process_fused_batch(
+                messages, amount_agent, pattern_agent
+            )
+
+        # Per agent, its results in message order; agents without analyze_batch
+        # are run on one message at a time
+        batch_results = [
+            fused_results[id(agent)] if id(agent) in fused_results
+            else _process_batch(messages, agent) if hasattr(agent, 'analyze_batch')
+            else [_process_message(message, agent) for message in messages]
+            for agent in agents
+        ]
+
+        # Regroup into per-message results, in agent order
+        all_agent_results = [list(agent_results) for agent_results in zip(*batch_results)]
+
+        # One aggregation call for the whole batch
+        all_aggregated = aggregator.aggregate_batch(all_agent_results)
+
+        append = processed_messages.append
+        for message, agent_results, aggregated in zip(messages, all_agent_results, all_aggregated):
+
+            # TODO 12: Mark messages as fraudulent (5 points)
+            # INSTRUCTIONS:
+            # 1. Use the aggregator to combine results from all agents
+            # 2. Call aggregator.aggregate_results(agent_results)
+            # 3. Get the aggregated fraud assessment
+            # 4. Update the message with fraud information:
+            #    - Set message['fraud_status'] to "FRAUDULENT" or "CLEAN"
+            #    - Set message['fraud_score'] to the confidence score
+            #    - Set message['fraud_reasons'] to the aggregated reasons
+            #
+            # EXAMPLE:
+            # if aggregator:
+            #     aggregated = aggregator.aggregate_results(agent_results)
+            #     message['fraud_status'] = "FRAUDULENT" if aggregated['is_fraudulent'] else "CLEAN"
+            #     message['fraud_score'] = aggregated['confidence']
+            #     message['fraud_reasons'] = aggregated['aggregated_reasons']
+            # else:
+            #     message['fraud_status'] = "PENDING"
+            #     message['fraud_score'] = 0
+            #     message['fraud_reasons'] = []
+
+            # YOUR CODE HERE - Aggregate results and mark messages
+            # For now, just store the raw results (remove after implementing TODO 12)
+            message['fraud_analysis'] = agent_results
+            message["fraud_status"] = (
+                "FRAUDULENT" if aggregated["is_fraudulent"] else "CLEAN"
+            )
+            message["fraud_score"] = aggregated["confidence"]
+            message["fraud_reasons"] = aggregated["aggregated_reasons"]
+
+            append(message)
 
         elapsed_time = time.time() - start_time
-        print(f"Parallel processing completed in {elapsed_time:.2f} seconds")
+        logger.info(f"Batch fraud detection completed in {elapsed_time:.2f} seconds")
 
         # Print fraud summary
         fraudulent_count = sum(1 for m in processed_messages
                               if m.get('fraud_status') == 'FRAUDULENT')
-        print(f"Fraud Detection Summary: {fraudulent_count}/{len(processed_messages)} messages flagged as fraudulent")
+        logger.info(f"Fraud Detection Summary: {fraudulent_count}/{len(processed_messages)} messages flagged as fraudulent")
 
         return processed_messages
 
@@ -231,24 +404,25 @@ class ParallelizationPattern:
             'remittance_info': 'Urgent payment needed immediately'
         }
 
-        print("Testing fraud detection agents:")
-        print(f"Test message: {test_message}")
-        print("\nAgent results:")
+        logger.info("Testing fraud detection agents:")
+        logger.info(f"Test message: {test_message}")
+        logger.info("\nAgent results:")
 
         for agent in self.list_of_agents:
             result = agent.analyze(test_message)
-            print(f"\n{agent.__class__.__name__}:")
-            print(f"  Risk Score: {result.get('risk_score', 0)}")
-            print(f"  Reasons: {result.get('fraud_reasons', [])}")
+            logger.info(f"\n{agent.__class__.__name__}:")
+            logger.info(f"  Risk Score: {result.get('risk_score', 0)}")
+            logger.info(f"  Reasons: {result.get('fraud_reasons', [])}")
 
         # Test aggregation if aggregator is available
         if hasattr(self, 'aggregator'):
             agent_results = [agent.analyze(test_message) for agent in self.list_of_agents]
             aggregated = self.aggregator.aggregate_results(agent_results)
-            print(f"\nAggregated Result:")
-            print(f"  Is Fraudulent: {aggregated['is_fraudulent']}")
-            print(f"  Confidence: {aggregated['confidence']}%")
-            print(f"  Total Risk Score: {aggregated['total_risk_score']}")
+            logger.info(f"\nAggregated Result:")
+            logger.info(f"  Is Fraudulent: {aggregated['is_fraudulent']}")
+            logger.info(f"  Confidence: {aggregated['confidence']}%")
+            logger.info(f"  Total Risk Score: {aggregated['total_risk_score']}")
+
 
 
 # Example of how to create a custom fraud detection agent
@@ -5,10 +5,166 @@ This module implements a chain of specialized agents for comprehensive fraud ana
 Each agent in the chain builds upon the insights from previous agents.
 """
 
-import json
+import asyncio
 from typing import Dict, List, Any
-from openai import OpenAI
-from config import Config
+
+import orjson
+from config import CONFIG
+from services.llm_service import get_async_openai_client
+from services.log_service import get_logger
+from services.serialization import dumps
+
+logger = get_logger(__name__)
+
+
+# Per stage: (list of per-message results, fields later stages quote from each
+# entry, top-level fields later stages quote). Stages not listed are passed whole.
+_STAGE_VIEW_FIELDS = {
+    "initial_screening": (
+        "screening_results", ("risk_level", "initial_flags"), ("summary",)
+    ),
+    "technical_analysis": (
+        "technical_analysis", ("format_compliance", "technical_issues", "technical_score"),
+        ("technical_summary",)
+    ),
+    "compliance_review": (
+        "compliance_review", ("aml_risk", "sanctions_risk", "compliance_issues", "compliance_score"),
+        ("compliance_summary", "escalation_required")
+    ),
+}
+
+
+def _stage_view(stage: str, results: Any) -> Any:
+    """
+    Trim a stage's results to the fields later prompts actually use.
+
+    Per-message entries are keyed by message_id. Results that do not have
+    the expected shape are returned unchanged.
+
+    Args:
+        stage: Name of the chain stage
+        results: Parsed LLM response of that stage
+
+    Returns:
+        Compact view of the results
+    """
+    fields = _STAGE_VIEW_FIELDS.get(stage)
+    if fields is None or not isinstance(results, dict) or not isinstance(results.get(fields[0]), list):
+        return results
+
+    list_key, item_fields, top_fields = fields
+    view = {
+        "per_message": {
+            str(item.get("message_id")): {field: item[field] for field in item_fields if field in item}
+            for item in results[list_key] if isinstance(item, dict)
+        }
+    }
+    for field in top_fields:
+        if field in results:
+            view[field] = results[field]
+    return view
+
+
+# Static prompt text, built once at import. User prompt templates take the
+# serialized payloads through %-formatting; response schemas are compact JSON.
+_INITIAL_SCREENER_SYSTEM = (
+    "You are an Initial Fraud Screener specializing in rapid triage of SWIFT transactions.\n"
+    "Your role is to quickly categorize transactions into risk levels.\n\n"
+    "For each transaction, assign:\n"
+    "- GREEN: Low risk, standard processing\n"
+    "- YELLOW: Medium risk, needs review\n"
+    "- RED: High risk, immediate attention\n\n"
+    "Consider: amounts, BIC codes, countries, and obvious red flags.\n"
+    "Return your analysis in JSON format."
+)
+_INITIAL_SCREENER_USER_TMPL = (
+    "Perform initial screening on these SWIFT messages:\n%s\n\n"
+    "Return JSON with structure:\n"
+    '{"screening_results":[{"message_id":"...","risk_level":"GREEN|YELLOW|RED",'
+    '"initial_flags":["..."],"recommended_action":"..."}],'
+    '"summary":"Overall batch assessment"}'
+)
+
+_TECHNICAL_ANALYST_SYSTEM = (
+    "You are a Technical Analyst specializing in SWIFT message format validation.\n"
+    "Review the initial screening results and perform deep technical analysis.\n\n"
+    "Focus on:\n"
+    "- SWIFT format compliance (MT103/MT202 standards)\n"
+    "- BIC code validation and legitimacy\n"
+    "- Amount format and currency validation\n"
+    "- Reference number patterns\n"
+    "- Date format compliance\n\n"
+    "Build upon the initial screening to identify technical anomalies.\n"
+    "Return your analysis in JSON format."
+)
+_TECHNICAL_ANALYST_USER_TMPL = (
+    "Review these SWIFT messages with initial screening results:\n\n"
+    "Messages: %s\n\n"
+    "Initial Screening: %s\n\n"
+    "Perform technical validation and return JSON with:\n"
+    '{"technical_analysis":[{"message_id":"...","format_compliance":true/false,'
+    '"bic_validation":{"sender":"status","receiver":"status"},'
+    '"technical_issues":["..."],"risk_adjustment":"increase|maintain|decrease",'
+    '"technical_score":0-100}],"technical_summary":"Overall technical assessment"}'
+)
+
+_RISK_ASSESSOR_SYSTEM = (
+    "You are a Risk Assessment Specialist.\n"
+    "Analyze behavioral patterns and transaction risks based on previous findings.\n"
+    "Focus on velocity, patterns, and behavioral anomalies."
+)
+_RISK_ASSESSOR_USER_TMPL = (
+    "Assess risk based on analysis so far:\n"
+    "Messages: %s\n"
+    "Current Analysis: %s\n\n"
+    "Return JSON with risk scores and pattern analysis."
+)
+
+_COMPLIANCE_OFFICER_SYSTEM = (
+    "You are a Compliance Officer specializing in AML and regulatory compliance.\n"
+    "Review all previous analysis and assess regulatory compliance risks.\n\n"
+    "Focus on:\n"
+    "- AML (Anti-Money Laundering) red flags\n"
+    "- Sanctions screening indicators\n"
+    "- PEP (Politically Exposed Persons) risks\n"
+    "- Regulatory reporting requirements\n"
+    "- KYC (Know Your Customer) concerns\n\n"
+    "Consider the complete analysis chain to make compliance determinations.\n"
+    "Return your analysis in JSON format."
+)
+_COMPLIANCE_OFFICER_USER_TMPL = (
+    "Review these SWIFT messages with complete analysis chain:\n\n"
+    "Messages: %s\n\n"
+    "Analysis Chain Results: %s\n\n"
+    "Perform compliance assessment and return JSON with:\n"
+    '{"compliance_review":[{"message_id":"...","aml_risk":"low|medium|high",'
+    '"sanctions_risk":"clear|potential|confirmed","compliance_issues":["..."],'
+    '"required_actions":["..."],"compliance_score":0-100}],'
+    '"compliance_summary":"Overall compliance assessment","escalation_required":true/false}'
+)
+
+_FINAL_REVIEWER_SYSTEM = (
+    "You are the Final Reviewer responsible for synthesizing all analysis.\n"
+    "Make the final fraud determination based on the complete analysis chain.\n\n"
+    "Review all findings from:\n"
+    "1. Initial Screening\n"
+    "2. Technical Analysis\n"
+    "3. Risk Assessment (if completed)\n"
+    "4. Compliance Review\n\n"
+    "Make final decisions: APPROVE, HOLD, or REJECT each transaction.\n"
+    "Provide clear justification based on the accumulated evidence.\n"
+    "Return your analysis in JSON format."
+)
+_FINAL_REVIEWER_USER_TMPL = (
+    "Make final determinations based on complete analysis:\n\n"
+    "Messages: %s\n\n"
+    "Complete Analysis Chain: %s\n\n"
+    "Return final decisions in JSON:\n"
+    '{"final_decisions":[{"message_id":"...","decision":"APPROVE|HOLD|REJECT",'
+    '"confidence":0-100,"key_factors":["..."],"justification":"...",'
+    '"follow_up_required":["..."]}],'
+    '"batch_summary":{"approved":0,"held":0,"rejected":0,"overall_risk":"low|medium|high"}}'
+)
 
 
 class PromptChainingPattern:
@@ -18,221 +174,86 @@ class PromptChainingPattern:
     """
 
     def __init__(self):
-        """Initialize the prompt chaining pattern with OpenAI client."""
-        self.config = Config()
-        self.client = OpenAI(api_key=self.config.OPENAI_API_KEY)
+        """Initialize the prompt chaining pattern."""
+        self.config = CONFIG
         self.model = "gpt-4o"
         self.temperature = 0.1  # Low temperature for consistent analysis
 
-    def _create_initial_screener_prompt(self, messages: List[Dict]) -> tuple:
+    def _create_initial_screener_prompt(self, msg_json: str) -> tuple:
         """
         Create prompt for the initial screening agent.
 
         Args:
-            messages: List of SWIFT messages to screen
+            msg_json: SWIFT messages to screen, serialized as JSON
 
         Returns:
             Tuple of (system_prompt, user_prompt)
         """
-        system_prompt = """You are an Initial Fraud Screener specializing in rapid triage of SWIFT transactions.
-        Your role is to quickly categorize transactions into risk levels.
-
-        For each transaction, assign:
-        - GREEN: Low risk, standard processing
-        - YELLOW: Medium risk, needs review
-        - RED: High risk, immediate attention
-
-        Consider: amounts, BIC codes, countries, and obvious red flags.
-        Return your analysis in JSON format."""
-
-        user_prompt = f"""Perform initial screening on these SWIFT messages:
-        {json.dumps(messages, indent=2)}
-
-        Return JSON with structure:
-        {{
-            "screening_results": [
-                {{
-                    "message_id": "...",
-                    "risk_level": "GREEN|YELLOW|RED",
-                    "initial_flags": ["..."],
-                    "recommended_action": "..."
-                }}
-            ],
-            "summary": "Overall batch assessment"
-        }}"""
-
-        return system_prompt, user_prompt
-
-    def _create_technical_analyst_prompt(self, messages: List[Dict], initial_screening: Dict) -> tuple:
+        return _INITIAL_SCREENER_SYSTEM, _INITIAL_SCREENER_USER_TMPL % (msg_json,)
+
+    def _create_technical_analyst_prompt(self, msg_json: str, initial_screening: Dict) -> tuple:
         """
         Create prompt for the technical analyst agent.
 
         Args:
-            messages: Original SWIFT messages
+            msg_json: Original SWIFT messages, serialized as JSON
             initial_screening: Results from initial screener
 
         Returns:
             Tuple of (system_prompt, user_prompt)
         """
-        system_prompt = """You are a Technical Analyst specializing in SWIFT message format validation.
-        Review the initial screening results and perform deep technical analysis.
-
-        Focus on:
-        - SWIFT format compliance (MT103/MT202 standards)
-        - BIC code validation and legitimacy
-        - Amount format and currency validation
-        - Reference number patterns
-        - Date format compliance
-
-        Build upon the initial screening to identify technical anomalies.
-        Return your analysis in JSON format."""
-
-        messages = self._make_json_safe(messages)
-        initial_screening = self._make_json_safe(initial_screening)
-        user_prompt = f"""Review these SWIFT messages with initial screening results:
-
-        Messages: {json.dumps(messages, indent=2)}
-
-        Initial Screening: {json.dumps(initial_screening, indent=2)}
-
-        Perform technical validation and return JSON with:
-        {{
-            "technical_analysis": [
-                {{
-                    "message_id": "...",
-                    "format_compliance": true/false,
-                    "bic_validation": {{"sender": "status", "receiver": "status"}},
-                    "technical_issues": ["..."],
-                    "risk_adjustment": "increase|maintain|decrease",
-                    "technical_score": 0-100
-                }}
-            ],
-            "technical_summary": "Overall technical assessment"
-        }}"""
-
-        return system_prompt, user_prompt
-
-    def _create_compliance_officer_prompt(self, messages: List[Dict], chain_results: Dict) -> tuple:
+        return _TECHNICAL_ANALYST_SYSTEM, _TECHNICAL_ANALYST_USER_TMPL % (
+            msg_json, dumps(initial_screening)
+        )
+
+    def _create_risk_assessor_prompt(self, msg_json: str, chain_results: Dict) -> tuple:
+        """
+        Create prompt for the risk assessment agent.
+
+        Args:
+            msg_json: Original SWIFT messages, serialized as JSON
+            chain_results: Analysis results so far
+
+        Returns:
+            Tuple of (system_prompt, user_prompt)
+        """
+        return _RISK_ASSESSOR_SYSTEM, _RISK_ASSESSOR_USER_TMPL % (
+            msg_json, dumps(chain_results)
+        )
+
+    def _create_compliance_officer_prompt(self, msg_json: str, chain_results: Dict) -> tuple:
         """
         Create prompt for the compliance officer agent.
 
         Args:
-            messages: Original SWIFT messages
+            msg_json: Original SWIFT messages, serialized as JSON
             chain_results: All previous analysis results
 
         Returns:
             Tuple of (system_prompt, user_prompt)
         """
-        system_prompt = """You are a Compliance Officer specializing in AML and regulatory compliance.
-        Review all previous analysis and assess regulatory compliance risks.
-
-        Focus on:
-        - AML (Anti-Money Laundering) red flags
-        - Sanctions screening indicators
-        - PEP (Politically Exposed Persons) risks
-        - Regulatory reporting requirements
-        - KYC (Know Your Customer) concerns
-
-        Consider the complete analysis chain to make compliance determinations.
-        Return your analysis in JSON format."""
-        messages = self._make_json_safe(messages)
-        chain_results = self._make_json_safe(chain_results)
-
-        user_prompt = f"""Review these SWIFT messages with complete analysis chain:
-
-        Messages: {json.dumps(messages, indent=2)}
-
-        Analysis Chain Results: {json.dumps(chain_results, indent=2)}
-
-        Perform compliance assessment and return JSON with:
-        {{
-            "compliance_review": [
-                {{
-                    "message_id": "...",
-                    "aml_risk": "low|medium|high",
-                    "sanctions_risk": "clear|potential|confirmed",
-                    "compliance_issues": ["..."],
-                    "required_actions": ["..."],
-                    "compliance_score": 0-100
-                }}
-            ],
-            "compliance_summary": "Overall compliance assessment",
-            "escalation_required": true/false
-        }}"""
-
-        return system_prompt, user_prompt
-
-    def _create_final_reviewer_prompt(self, messages: List[Dict], complete_chain: Dict) -> tuple:
+        return _COMPLIANCE_OFFICER_SYSTEM, _COMPLIANCE_OFFICER_USER_TMPL % (
+            msg_json, dumps(chain_results)
+        )
+
+    def _create_final_reviewer_prompt(self, msg_json: str, complete_chain: Dict) -> tuple:
         """
         Create prompt for the final review agent.
 
         Args:
-            messages: Original SWIFT messages
+            msg_json: Original SWIFT messages, serialized as JSON
             complete_chain: All analysis results from the chain
 
         Returns:
             Tuple of (system_prompt, user_prompt)
         """
-        system_prompt = """You are the Final Reviewer responsible for synthesizing all analysis.
-        Make the final fraud determination based on the complete analysis chain.
-
-        Review all findings from:
-        1. Initial Screening
-        2. Technical Analysis
-        3. Risk Assessment (if completed)
-        4. Compliance Review
-
-        Make final decisions: APPROVE, HOLD, or REJECT each transaction.
-        Provide clear justification based on the accumulated evidence.
-        Return your analysis in JSON format."""
-
-        messages = self._make_json_safe(messages)
-        complete_chain = self._make_json_safe(complete_chain)
-        user_prompt = f"""Make final determinations based on complete analysis:
-
-        Messages: {json.dumps(messages, indent=2)}
-
-        Complete Analysis Chain: {json.dumps(complete_chain, indent=2)}
-
-        Return final decisions in JSON:
-        {{
-            "final_decisions": [
-                {{
-                    "message_id": "...",
-                    "decision": "APPROVE|HOLD|REJECT",
-                    "confidence": 0-100,
-                    "key_factors": ["..."],
-                    "justification": "...",
-                    "follow_up_required": ["..."]
-                }}
-            ],
-            "batch_summary": {{
-                "approved": 0,
-                "held": 0,
-                "rejected": 0,
-                "overall_risk": "low|medium|high"
-            }}
-        }}"""
-
-        return system_prompt, user_prompt
-
-    def _make_json_safe(self, obj):
-        """
-        Recursively convert non-JSON-serializable objects (e.g. datetime)
-        into safe string representations for LLM prompts.
-        """
-        if isinstance(obj, dict):
-            return {k: self._make_json_safe(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._make_json_safe(v) for v in obj]
-        elif hasattr(obj, "isoformat"):
-            return obj.isoformat()
-        else:
-            return obj
-
-    def _call_llm(self, system_prompt: str, user_prompt: str) -> Dict:
+        return _FINAL_REVIEWER_SYSTEM, _FINAL_REVIEWER_USER_TMPL % (
+            msg_json, dumps(complete_chain)
+        )
+
+    async def _call_llm(self, system_prompt: str, user_prompt: str) -> Dict:
         """
-        Make a call to the LLM with the given prompts.
+        Make a call to the LLM with the given prompts without blocking the event loop.
 
         Args:
             system_prompt: System role prompt
@@ -242,20 +263,28 @@ class PromptChainingPattern:
             Parsed JSON response from the LLM
         """
         try:
-            response = self.client.chat.completions.create(
+            stream = await get_async_openai_client().chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_format={"type": "json_object"},
-                temperature=self.temperature
+                temperature=self.temperature,
+                stream=True
             )
 
-            return json.loads(response.choices[0].message.content or "{}")
+            # Tokens are consumed as they arrive, yielding to other coroutines
+            # (e.g. the concurrent Step 2/3 call or other batches) in between
+            chunks = []
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    chunks.append(chunk.choices[0].delta.content)
+
+            return orjson.loads("".join(chunks) or "{}")
 
         except Exception as e:
-            print(f"Error calling LLM: {e}")
+            logger.error(f"Error calling LLM: {e}")
             return {}
 
     def process_chain(self, messages: List[Dict]) -> Dict:
@@ -268,15 +297,52 @@ class PromptChainingPattern:
         Returns:
             Complete analysis results from all agents in the chain
         """
-        print("Starting Prompt Chaining Analysis...")
+        return asyncio.run(self.aprocess_chain(messages))
+
+    def process_batches(self, batches: List[List[Dict]]) -> List[Dict]:
+        """
+        Process several message batches through the chain concurrently.
+
+        Each batch still runs its own chain; the batches' LLM calls overlap.
+
+        Args:
+            batches: Lists of SWIFT messages, one chain per list
+
+        Returns:
+            Chain results per batch, in input order
+        """
+        async def run_all():
+            return await asyncio.gather(*(self.aprocess_chain(batch) for batch in batches))
+
+        return list(asyncio.run(run_all()))
+
+    async def aprocess_chain(self, messages: List[Dict]) -> Dict:
+        """
+        Async variant of process_chain.
+
+        The Technical Analyst and Risk Assessor only need the initial
+        screening, so they run concurrently.
+
+        Args:
+            messages: List of SWIFT messages to analyze
+
+        Returns:
+            Complete analysis results from all agents in the chain
+        """
+        logger.info("Starting Prompt Chaining Analysis...")
         chain_results = {}
 
         # Step 1: Initial Screening
-        print("Step 1: Initial Screener analyzing messages...")
-        messages = self._make_json_safe(messages)
-        system_prompt, user_prompt = self._create_initial_screener_prompt(messages)
-        initial_results = self._call_llm(system_prompt, user_prompt)
+        logger.info("Step 1: Initial Screener analyzing messages...")
+        # Shallow copies: final decisions are recorded without touching the caller's dicts
+        messages = [dict(message) for message in messages]
+        # Every stage sends the same messages; serialize them once
+        msg_json = dumps(messages)
+        system_prompt, user_prompt = self._create_initial_screener_prompt(msg_json)
+        initial_results = await self._call_llm(system_prompt, user_prompt)
         chain_results['initial_screening'] = initial_results
+        # Later prompts get trimmed views of the earlier stages, not the full chain
+        summary_view = {'initial_screening': _stage_view('initial_screening', initial_results)}
 
         # TODO 13: Implement Step 2 (7 points)
         # INSTRUCTIONS:
@@ -293,28 +359,27 @@ class PromptChainingPattern:
         # chain_results['technical_analysis'] = technical_results
 
         # YOUR CODE HERE - Implement Step 2: Technical Analyst
-        print("Step 2: Technical Analyst reviewing messages...")
+        logger.info("Step 2: Technical Analyst reviewing messages...")
         system_prompt, user_prompt = self._create_technical_analyst_prompt(
-            messages, initial_results
+            msg_json, summary_view['initial_screening']
         )
-        technical_results = self._call_llm(system_prompt, user_prompt)
-        chain_results["technical_analysis"] = technical_results
+        technical_call = self._call_llm(system_prompt, user_prompt)
 
         # Step 3: Risk Assessor (Provided as example)
-        print("Step 3: Risk Assessor evaluating patterns...")
-        # This step is implemented for you as an example
-        risk_prompt_system = """You are a Risk Assessment Specialist.
-        Analyze behavioral patterns and transaction risks based on previous findings.
-        Focus on velocity, patterns, and behavioral anomalies."""
-
-        risk_prompt_user = f"""Assess risk based on analysis so far:
-        Messages: {json.dumps(messages, indent=2)}
-        Current Analysis: {json.dumps(chain_results, indent=2)}
-
-        Return JSON with risk scores and pattern analysis."""
+        logger.info("Step 3: Risk Assessor evaluating patterns...")
+        # Built from the initial screening only, so it can run alongside Step 2
+        risk_prompt_system, risk_prompt_user = self._create_risk_assessor_prompt(
+            msg_json, summary_view
+        )
 
-        risk_results = self._call_llm(risk_prompt_system, risk_prompt_user)
+        technical_results, risk_results = await asyncio.gather(
+            technical_call,
+            self._call_llm(risk_prompt_system, risk_prompt_user)
+        )
+        chain_results["technical_analysis"] = technical_results
         chain_results['risk_assessment'] = risk_results
+        summary_view['technical_analysis'] = _stage_view('technical_analysis', technical_results)
+        summary_view['risk_assessment'] = _stage_view('risk_assessment', risk_results)
 
         # TODO 14: Implement Step 4 (8 points)
         # INSTRUCTIONS:
@@ -331,17 +396,18 @@ class PromptChainingPattern:
         # chain_results['compliance_review'] = compliance_results
 
         # YOUR CODE HERE - Implement Step 4: Compliance Officer
-        print("Step 4: Compliance Officer reviewing for regulatory issues...")
+        logger.info("Step 4: Compliance Officer reviewing for regulatory issues...")
         system_prompt, user_prompt = self._create_compliance_officer_prompt(
-            messages, chain_results
+            msg_json, summary_view
         )
-        compliance_results = self._call_llm(system_prompt, user_prompt)
+        compliance_results = await self._call_llm(system_prompt, user_prompt)
         chain_results["compliance_review"] = compliance_results
+        summary_view['compliance_review'] = _stage_view('compliance_review', compliance_results)
         
         # Step 5: Final Reviewer (Provided)
-        print("Step 5: Final Reviewer making decisions...")
-        system_prompt, user_prompt = self._create_final_reviewer_prompt(messages, chain_results)
-        final_results = self._call_llm(system_prompt, user_prompt)
+        logger.info("Step 5: Final Reviewer making decisions...")
+        system_prompt, user_prompt = self._create_final_reviewer_prompt(msg_json, summary_view)
+        final_results = await self._call_llm(system_prompt, user_prompt)
         chain_results['final_review'] = final_results
 
         # Update messages with final decisions
@@ -355,7 +421,7 @@ class PromptChainingPattern:
                     message['fraud_confidence'] = decision.get('confidence', 0)
                     message['fraud_justification'] = decision.get('justification', '')
 
-        print("Prompt Chaining Analysis Complete!")
+        logger.info("Prompt Chaining Analysis Complete!")
         return chain_results
 
     def test_chain(self):
@@ -384,19 +450,19 @@ class PromptChainingPattern:
             }
         ]
 
-        print("Testing Prompt Chain with sample messages:")
+        logger.info("Testing Prompt Chain with sample messages:")
         results = self.process_chain(test_messages)
 
         # Print summary of results
-        print("\n=== Chain Results Summary ===")
+        logger.info("\n=== Chain Results Summary ===")
         for stage, data in results.items():
-            print(f"\n{stage.upper()}:")
+            logger.info(f"\n{stage.upper()}:")
             if isinstance(data, dict):
                 # Print key findings from each stage
                 if 'summary' in data:
-                    print(f"  Summary: {data['summary']}")
+                    logger.info(f"  Summary: {data['summary']}")
                 elif 'batch_summary' in data:
-                    print(f"  Batch Summary: {data['batch_summary']}")
+                    logger.info(f"  Batch Summary: {data['batch_summary']}")
 
         return results
 
@@ -18,15 +18,30 @@ class Config:
     # Processing settings
     MAX_WORKERS = 8
     BATCH_SIZE = 50
+    TOOL_CONCURRENCY_LIMIT = int(os.getenv("TOOL_CONCURRENCY_LIMIT", "8"))
+    # Requests per minute allowed by the OpenAI account; 0 disables client-side limiting
+    RPM_LIMIT = int(os.getenv("RPM_LIMIT", "0"))
+    # Send evaluator/correction prompts as OpenAI Batch API jobs: half the cost,
+    # but results can take up to the completion window to arrive
+    USE_BATCH_API = os.getenv("USE_BATCH_API", "false").lower() in ("1", "true", "yes")
+    BATCH_POLL_INTERVAL = float(os.getenv("BATCH_POLL_INTERVAL", "10"))
+    BATCH_COMPLETION_WINDOW = "24h"
     
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
     
+    # Settings reported by get_all_settings; add new settings here as well
+    _PUBLIC_SETTINGS = (
+        "BANK_COUNT", "BATCH_COMPLETION_WINDOW", "BATCH_POLL_INTERVAL", "BATCH_SIZE",
+        "MAX_WORKERS", "MESSAGE_COUNT", "OPENAI_API_KEY", "OPENAI_MODEL",
+        "RPM_LIMIT", "TOOL_CONCURRENCY_LIMIT", "USE_BATCH_API",
+    )
+
     @classmethod
     def get_all_settings(cls) -> Dict[str, Any]:
         """Get all configuration settings as a dictionary"""
-        return {
-            attr: getattr(cls, attr)
-            for attr in dir(cls)
-            if not attr.startswith('_') and not callable(getattr(cls, attr))
-        }
+        return {attr: getattr(cls, attr) for attr in cls._PUBLIC_SETTINGS}
+
+
+# Shared settings instance; Config only holds class-level settings, so one is enough
+CONFIG = Config()
@@ -6,26 +6,78 @@ This is the main integration point where all agent patterns work together
 to process SWIFT messages through a complete pipeline.
 """
 
+import asyncio
+from functools import lru_cache
 from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from config import Config
+from config import CONFIG
 from models.swift_message import SWIFTMessage
 from services.swift_generator import SWIFTGenerator
+from services.log_service import get_logger
 
 # Import the agent patterns you'll be using
 from agents.evaluator_optimizer import EvaluatorOptimizerPattern
 from agents.parallelization import ParallelizationPattern
 from agents.orchestrator_worker import OrchestratorWorkerPattern
 from agents.prompt_chaining import PromptChainingPattern
-import json
+import orjson
 from datetime import datetime
 
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _leading_amount(amount: str) -> float:
+    """Parse the number in front of an amount like "12345.67 USD"; cached by string."""
+    return float(amount.split()[0])
+
+
+# Datetimes and other non-JSON values go through str(), as json.dump(default=str) did
+_REPORT_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+# Container levels written entry by entry: report -> results -> task_results
+REPORT_STREAM_DEPTH = 3
+
+
+def _write_json(f, obj, depth: int, level: int = 0):
+    """
+    Write obj as 2-space indented JSON, streaming the first depth container levels.
+
+    Args:
+        f: Binary file to write to
+        obj: Value to serialize
+        depth: Number of nested container levels to stream
+        level: Nesting level of obj, used for indentation
+    """
+    if depth <= 0 or not isinstance(obj, (dict, list, tuple)) or not obj:
+        payload = orjson.dumps(obj, default=str, option=_REPORT_OPTIONS | orjson.OPT_INDENT_2)
+        if level:
+            # Nested values are indented to their level; strings never contain a raw newline
+            payload = payload.replace(b"\n", b"\n" + b"  " * level)
+        f.write(payload)
+        return
+
+    indent = b"\n" + b"  " * (level + 1)
+    if isinstance(obj, dict):
+        f.write(b"{")
+        for index, (key, value) in enumerate(obj.items()):
+            f.write(indent if index == 0 else b"," + indent)
+            # Encode the key exactly as orjson would inside an object: {key: null}
+            f.write(orjson.dumps({key: None}, default=str, option=_REPORT_OPTIONS)[1:-6] + b": ")
+            _write_json(f, value, depth - 1, level + 1)
+        f.write(b"\n" + b"  " * level + b"}")
+    else:
+        f.write(b"[")
+        for index, value in enumerate(obj):
+            f.write(indent if index == 0 else b"," + indent)
+            _write_json(f, value, depth - 1, level + 1)
+        f.write(b"\n" + b"  " * level + b"]")
+
+
 class SWIFTProcessingSystem:
     """Main system orchestrating all agent patterns for SWIFT processing"""
 
     def __init__(self):
-        self.config = Config()
+        self.config = CONFIG
         self.swift_generator = SWIFTGenerator()
 
         # Initialize agent patterns
@@ -50,25 +102,29 @@ class SWIFTProcessingSystem:
 
         This method calls the evaluator optimizer pattern to validate and fix messages.
         """
-        print("\n" + "=" * 60)
-        print("STEP 1: EVALUATOR-OPTIMIZER PATTERN")
-        print("=" * 60)
+        return asyncio.run(self.aprocess_with_evaluator_optimizer(messages))
+
+    async def aprocess_with_evaluator_optimizer(self, messages: List[Dict]) -> List[Dict]:
+        """Async variant of process_with_evaluator_optimizer"""
+        logger.info("\n" + "=" * 60)
+        logger.info("STEP 1: EVALUATOR-OPTIMIZER PATTERN")
+        logger.info("=" * 60)
 
         # Call the evaluator optimizer's process method
-        validated_messages = self.evaluator_optimizer.process_with_evaluator_optimizer(messages)
+        validated_messages = await self.evaluator_optimizer.aprocess_with_evaluator_optimizer(messages)
         return validated_messages
 
     def process_with_parallelization(self, messages: List[Dict]) -> List[Dict]:
         """
-        Step 2: Process messages in parallel with fraud detection
+        Step 2: Process messages with fraud detection
 
-        This method uses parallel processing to run multiple fraud detection agents.
+        This method runs multiple fraud detection agents over the whole batch.
         """
-        print("\n" + "=" * 60)
-        print("STEP 2: PARALLELIZATION PATTERN")
-        print("=" * 60)
+        logger.info("\n" + "=" * 60)
+        logger.info("STEP 2: PARALLELIZATION PATTERN")
+        logger.info("=" * 60)
 
-        # Process messages in parallel using fraud detection agents
+        # Score the messages with the fraud detection agents
         processed_messages = self.parallelization_agent.process_batch_parallel(messages)
         return processed_messages
 
@@ -78,18 +134,28 @@ class SWIFTProcessingSystem:
 
         This method chains multiple AI agents for comprehensive fraud analysis.
         """
-        print("\n" + "=" * 60)
-        print("STEP 3: PROMPT CHAINING PATTERN")
-        print("=" * 60)
+        return asyncio.run(self.aprocess_with_prompt_chaining(messages))
+
+    async def aprocess_with_prompt_chaining(self, messages: List[Dict]) -> Dict:
+        """Async variant of process_with_prompt_chaining"""
+        logger.info("\n" + "=" * 60)
+        logger.info("STEP 3: PROMPT CHAINING PATTERN")
+        logger.info("=" * 60)
 
         # Process through the chain of agents
-        chain_results = self.prompt_chaining_agent.process_chain(messages)
+        chain_results = await self.prompt_chaining_agent.aprocess_chain(messages)
         return chain_results
 
     def write_report(self, filename: str, data):
-        """Write analysis report to disk as JSON."""
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        """
+        Write analysis report to disk as JSON.
+
+        The report is streamed: the outer containers are written entry by
+        entry, so only one entry is ever held in serialized form. The bytes
+        are the same as orjson.dumps(data) with the same options.
+        """
+        with open(filename, "wb") as f:
+            _write_json(f, data, REPORT_STREAM_DEPTH)
 
     def process_with_orchestrator_worker(self, messages: List[Dict]) -> None:
         """
@@ -97,9 +163,17 @@ class SWIFTProcessingSystem:
 
         This method uses an orchestrator to create tasks and workers to execute them.
         """
-        print("\n" + "=" * 60)
-        print("STEP 4: ORCHESTRATOR-WORKER PATTERN")
-        print("=" * 60)
+        asyncio.run(self.aprocess_with_orchestrator_worker(messages))
+
+    async def aprocess_with_orchestrator_worker(self, messages: List[Dict]) -> None:
+        """
+        Async variant of process_with_orchestrator_worker
+
+        Both report sets are processed at the same time.
+        """
+        logger.info("\n" + "=" * 60)
+        logger.info("STEP 4: ORCHESTRATOR-WORKER PATTERN")
+        logger.info("=" * 60)
 
         # TODO 5: Modify clean messages logic (5 points)
         # INSTRUCTIONS:
@@ -131,55 +205,70 @@ class SWIFTProcessingSystem:
         # Option 3 - Specific message type:
         # clean_messages = [msg for msg in messages if msg.get('message_type') == 'MT103']
 
-        # Current implementation (Set 1) - Non-fraudulent messages
-        clean_messages = [msg for msg in messages if msg.get('fraud_status') != "FRAUDULENT"]
-
-        # Process with orchestrator
-        clean_report = self.orchestrator_worker.process_with_orchestrator(clean_messages)
-
-        self.write_report(
-            "report_clean_messages.json",
-            {
-                "generated_at": datetime.utcnow().isoformat(),
-                "filter": "clean_messages",
-                "message_count": len(clean_messages),
-                "results": clean_report
-            }
-        )
-
+        # Set 1 (non-fraudulent) and Set 2 (high value) are filtered in one pass
+        clean_messages = []
         high_value_messages = []
         for msg in messages:
+            if msg.get('fraud_status') != "FRAUDULENT":
+                clean_messages.append(msg)
             try:
-                amount = float(msg.get("amount", "0").split()[0])
-                if amount > 50000:
+                if _leading_amount(msg.get("amount", "0")) > 50000:
                     high_value_messages.append(msg)
             except Exception:
                 pass
 
-        print(f"Running orchestrator on HIGH-VALUE messages ({len(high_value_messages)})")
-        high_value_report = self.orchestrator_worker.process_with_orchestrator(high_value_messages)
+        # Process both sets with the orchestrator; each run is blocking network I/O.
+        # Each report is written as soon as its own run finishes
+        logger.info(f"Running orchestrator on CLEAN ({len(clean_messages)}) and "
+                    f"HIGH-VALUE ({len(high_value_messages)}) messages")
+        report_sets = (
+            ("clean_messages", clean_messages, "report_clean_messages.json"),
+            ("high_value_messages", high_value_messages, "report_high_value_messages.json")
+        )
+        outcomes = await asyncio.gather(
+            *(self._run_report_set(name, subset, filename) for name, subset, filename in report_sets),
+            return_exceptions=True
+        )
+        for (name, _, _), outcome in zip(report_sets, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"[{name}] Orchestrator run failed, no report written: {outcome}")
+
+    async def _run_report_set(self, name: str, messages: List[Dict], filename: str) -> None:
+        """
+        Run the orchestrator on one report set and write its report.
+
+        Args:
+            name: Report set name, used as the report filter and to tag log lines
+            messages: Messages in the report set
+            filename: Path of the report to write
+        """
+        report = await asyncio.to_thread(self.orchestrator_worker.process_with_orchestrator, messages, name)
         self.write_report(
-            "report_high_value_messages.json",
+            filename,
             {
                 "generated_at": datetime.utcnow().isoformat(),
-                "filter": "high_value_messages",
-                "message_count": len(high_value_messages),
-                "results": high_value_report
+                "filter": name,
+                "message_count": len(messages),
+                "results": report
             }
         )
-        
-    
+        logger.info(f"[{name}] Report written to {filename}")
+
     def run(self):
         """Main execution method - Orchestrates all agent patterns in sequence"""
+        asyncio.run(self._run_async())
+
+    async def _run_async(self):
+        """Run all agent patterns on one event loop, so LLM-bound stages share its connections"""
         try:
-            print("=" * 60)
-            print("SWIFT TRANSACTION PROCESSING SYSTEM")
-            print("=" * 60)
+            logger.info("=" * 60)
+            logger.info("SWIFT TRANSACTION PROCESSING SYSTEM")
+            logger.info("=" * 60)
 
             # Step 1: Generate SWIFT messages
-            print("\nGenerating SWIFT messages...")
+            logger.info("\nGenerating SWIFT messages...")
             messages = self.generate_swift_messages()
-            print(f"Generated {len(messages)} SWIFT messages")
+            logger.info(f"Generated {len(messages)} SWIFT messages")
 
             # TODO 1: Call evaluator optimizer (5 points)
             # INSTRUCTIONS:
@@ -190,7 +279,7 @@ class SWIFTProcessingSystem:
             # validated_messages = self.process_with_evaluator_optimizer(messages)
             #
             # YOUR CODE HERE (remove the pass statement):
-            validated_messages = self.process_with_evaluator_optimizer(messages)
+            validated_messages = await self.aprocess_with_evaluator_optimizer(messages)
 
             # TODO 2: Call parallelization process (5 points)
             # INSTRUCTIONS:
@@ -201,7 +290,8 @@ class SWIFTProcessingSystem:
             # processed_messages = self.process_with_parallelization(validated_messages)
             #
             # YOUR CODE HERE (remove the pass statement):
-            processed_messages = self.process_with_parallelization(validated_messages)
+            # CPU-bound fraud scoring runs off the event loop
+            processed_messages = await asyncio.to_thread(self.process_with_parallelization, validated_messages)
 
             # TODO 3: Call prompt chaining (5 points)
             # INSTRUCTIONS:
@@ -212,7 +302,7 @@ class SWIFTProcessingSystem:
             # chain_results = self.process_with_prompt_chaining(processed_messages)
             #
             # YOUR CODE HERE (remove the pass statement):
-            chain_results = self.process_with_prompt_chaining(processed_messages)
+            chain_results = await self.aprocess_with_prompt_chaining(processed_messages)
 
             # TODO 4: Pass results to orchestrator (5 points)
             # INSTRUCTIONS:
@@ -223,14 +313,14 @@ class SWIFTProcessingSystem:
             # self.process_with_orchestrator_worker(processed_messages)
             #
             # YOUR CODE HERE (remove the pass statement):
-            self.process_with_orchestrator_worker(processed_messages)
+            await self.aprocess_with_orchestrator_worker(processed_messages)
 
-            print("\n" + "=" * 60)
-            print("PROCESSING COMPLETE")
-            print("=" * 60)
+            logger.info("\n" + "=" * 60)
+            logger.info("PROCESSING COMPLETE")
+            logger.info("=" * 60)
 
         except Exception as e:
-            print(f"Error in main execution: {e}")
+            logger.error(f"Error in main execution: {e}")
             raise
 
 
@@ -2,14 +2,138 @@
 LLM service for fraud analysis and SWIFT message correction using OpenAI
 """
 
+import asyncio
 import json
 import logging
+import random
+import time
+import weakref
+from functools import lru_cache
 from typing import Dict, List, Any
-import os
 
-from openai import OpenAI
+import openai
+from openai import AsyncOpenAI, OpenAI
 from models.swift_message import SWIFTMessage
-from config import Config
+from config import Config, CONFIG
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """
+    Get the process-wide OpenAI client
+
+    Sharing one client lets every caller reuse the same keep-alive
+    connection pool instead of paying a TCP/TLS handshake per instance.
+    The SDK's default pool limits already cover concurrent dispatch.
+    """
+    return OpenAI(api_key=Config.OPENAI_API_KEY)
+
+
+@lru_cache(maxsize=1)
+def get_default_llm_service() -> "LLMService":
+    """
+    Get the LLMService shared by all agents
+    """
+    return LLMService()
+
+
+# httpx connection pools are bound to the event loop that created them,
+# so every loop (e.g. each asyncio.run) gets its own AsyncOpenAI client.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Get the AsyncOpenAI client for the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        client = AsyncOpenAI(api_key=Config.OPENAI_API_KEY)
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+# Transient failures worth retrying; anything else is raised to the caller
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+RETRY_ATTEMPTS = 4
+RETRY_MULTIPLIER = 0.5
+RETRY_MAX_WAIT = 8.0
+
+
+def _backoff_delay(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff: uniform in [0, min(max, multiplier * 2**attempt)]
+
+    Jitter keeps concurrent callers that hit the same rate limit from
+    retrying in lockstep.
+    """
+    return random.uniform(0, min(RETRY_MAX_WAIT, RETRY_MULTIPLIER * 2 ** attempt))
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """
+    Delay before the next attempt, honouring the server's Retry-After on 429s
+    """
+    delay = _backoff_delay(attempt)
+    response = getattr(error, "response", None)
+    if isinstance(error, openai.RateLimitError) and response is not None:
+        try:
+            delay = max(delay, float(response.headers.get("retry-after", 0)))
+        except ValueError:
+            pass
+    return delay
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket that spaces requests to stay under a requests-per-minute budget
+
+    Up to one second's worth of requests may go out in a burst; after that
+    callers wait in arrival order for the bucket to refill.
+    """
+
+    def __init__(self, requests_per_minute: int):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        Wait until a request may be sent
+        """
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+_RATE_LIMITERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncTokenBucket]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_rate_limiter():
+    """
+    Get the request limiter for the running event loop, or None if Config.RPM_LIMIT is unset
+    """
+    if Config.RPM_LIMIT <= 0:
+        return None
+    loop = asyncio.get_running_loop()
+    limiter = _RATE_LIMITERS.get(loop)
+    if limiter is None:
+        limiter = AsyncTokenBucket(Config.RPM_LIMIT)
+        _RATE_LIMITERS[loop] = limiter
+    return limiter
 
 
 class LLMService:
@@ -19,12 +143,12 @@ class LLMService:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.config = Config()
+        self.config = CONFIG
         
         # Initialize OpenAI client
         # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
         # do not change this unless explicitly requested by the user
-        self.client = OpenAI(api_key=self.config.OPENAI_API_KEY)
+        self.client = get_openai_client()
         self.model = self.config.OPENAI_MODEL
         
         self.logger.info(f"LLM Service initialized with model: {self.model}")
@@ -74,34 +198,167 @@ class LLMService:
                 "recommended_actions": ["Manual review required due to system error"]
             }
     
+    def _swift_correction_request(self, prompt: str) -> Dict[str, Any]:
+        """
+        Build the chat completion arguments for a SWIFT correction prompt
+        """
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a SWIFT message validation expert. "
+                    "Your task is to correct SWIFT message format errors while "
+                    "maintaining the business intent of the transaction. "
+                    "Respond with JSON containing the corrected fields."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.1
+        }
+
+    def request_swift_correction(self, prompt: str) -> Dict[str, Any]:
+        """
+        Get SWIFT message corrections from LLM, retrying transient API errors
+
+        Raises:
+            openai.OpenAIError: If the request fails for good
+        """
+        # Retries are done here with jitter, so the SDK's own retries are disabled
+        client = self.client.with_options(max_retries=0)
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                response = client.chat.completions.create(
+                    **self._swift_correction_request(prompt)
+                )
+                break
+            except RETRYABLE_ERRORS as e:
+                if attempt == RETRY_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(e, attempt)
+                self.logger.warning(f"LLM SWIFT correction retry {attempt + 1} in {delay:.2f}s: {str(e)}")
+                time.sleep(delay)
+
+        return json.loads(response.choices[0].message.content or "{}")
+
+    async def arequest_swift_correction(self, prompt: str) -> Dict[str, Any]:
+        """
+        Async variant of request_swift_correction
+
+        Raises:
+            openai.OpenAIError: If the request fails for good
+        """
+        client = get_async_openai_client().with_options(max_retries=0)
+        limiter = get_async_rate_limiter()
+        for attempt in range(RETRY_ATTEMPTS):
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                response = await client.chat.completions.create(
+                    **self._swift_correction_request(prompt)
+                )
+                break
+            except RETRYABLE_ERRORS as e:
+                if attempt == RETRY_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(e, attempt)
+                self.logger.warning(f"LLM SWIFT correction retry {attempt + 1} in {delay:.2f}s: {str(e)}")
+                await asyncio.sleep(delay)
+
+        return json.loads(response.choices[0].message.content or "{}")
+
+    def run_chat_batch(self, prompts: List[str]) -> List[Any]:
+        """
+        Run SWIFT correction prompts as one OpenAI Batch API job
+
+        The prompts are uploaded as a JSONL file, the job is polled until it
+        finishes and its output is matched back to the prompts by custom_id.
+
+        Args:
+            prompts: Prompts to send, each with the SWIFT correction system message
+
+        Returns:
+            Parsed JSON response per prompt, in input order; None for prompts
+            whose request failed or whose response was not valid JSON
+
+        Raises:
+            openai.OpenAIError: If the batch job cannot be created or does not complete
+        """
+        if not prompts:
+            return []
+
+        lines = [
+            json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._swift_correction_request(prompt)
+            })
+            for index, prompt in enumerate(prompts)
+        ]
+        batch_file = self.client.files.create(
+            file=("swift_batch.jsonl", "\n".join(lines).encode()),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.config.BATCH_COMPLETION_WINDOW
+        )
+        self.logger.info(f"LLM batch {batch.id} submitted with {len(prompts)} request(s)")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(self.config.BATCH_POLL_INTERVAL)
+            batch = self.client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise openai.OpenAIError(f"LLM batch {batch.id} ended with status {batch.status}")
+
+        results: List[Any] = [None] * len(prompts)
+        if batch.output_file_id is None:
+            return results
+
+        # Output lines arrive in completion order, not submission order
+        output = self.client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line:
+                continue
+            record = json.loads(line)
+            index = int(record["custom_id"])
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                self.logger.error(f"LLM batch request {index} failed: {record.get('error')}")
+                continue
+            try:
+                content = response["body"]["choices"][0]["message"]["content"]
+                results[index] = json.loads(content or "{}")
+            except (KeyError, IndexError, json.JSONDecodeError) as e:
+                self.logger.error(f"LLM batch request {index} returned an unusable response: {str(e)}")
+
+        return results
+
     def get_swift_correction(self, prompt: str) -> Dict[str, Any]:
         """
         Get SWIFT message corrections from LLM
         """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a SWIFT message validation expert. "
-                        "Your task is to correct SWIFT message format errors while "
-                        "maintaining the business intent of the transaction. "
-                        "Respond with JSON containing the corrected fields."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1
-            )
-            
-            result = json.loads(response.choices[0].message.content or "{}")
-            
-            return result
-            
+            return self.request_swift_correction(prompt)
+
+        except Exception as e:
+            self.logger.error(f"LLM SWIFT correction failed: {str(e)}")
+            return {}
+
+    async def aget_swift_correction(self, prompt: str) -> Dict[str, Any]:
+        """
+        Get SWIFT message corrections from LLM without blocking the event loop
+        """
+        try:
+            return await self.arequest_swift_correction(prompt)
+
         except Exception as e:
             self.logger.error(f"LLM SWIFT correction failed: {str(e)}")
             return {}
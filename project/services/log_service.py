@@ -0,0 +1,50 @@
+"""
+Logging service for the SWIFT processing pipeline
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+
+_lock = threading.Lock()
+_queue_handler = None
+
+
+def _get_queue_handler() -> logging.handlers.QueueHandler:
+    """
+    Create the shared queue handler and start its listener on first use
+    """
+    global _queue_handler
+    with _lock:
+        if _queue_handler is None:
+            log_queue = queue.SimpleQueue()
+
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+            listener = logging.handlers.QueueListener(log_queue, stream_handler)
+            listener.start()
+            # Flush whatever is still queued when the interpreter exits
+            atexit.register(listener.stop)
+
+            _queue_handler = logging.handlers.QueueHandler(log_queue)
+        return _queue_handler
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a pipeline logger whose records are written by one background thread
+
+    Callers only enqueue records, so concurrent workers never contend on
+    the stdout lock.
+    """
+    logger = logging.getLogger(name)
+    handler = _get_queue_handler()
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
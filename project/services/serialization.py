@@ -0,0 +1,29 @@
+"""
+JSON serialization helpers for LLM prompts
+"""
+
+from typing import Any
+
+import orjson
+
+
+def json_default(obj: Any) -> Any:
+    """Serialize values orjson cannot encode natively for LLM prompts."""
+    return obj.isoformat() if hasattr(obj, "isoformat") else str(obj)
+
+
+def dumps(obj: Any, option: int = 0) -> str:
+    """
+    Serialize to compact JSON for LLM prompts.
+
+    orjson emits no whitespace and encodes datetimes as ISO 8601 natively,
+    so payloads need no pre-pass to make them JSON-safe.
+
+    Args:
+        obj: Value to serialize
+        option: Extra orjson options, e.g. orjson.OPT_SORT_KEYS
+
+    Returns:
+        The JSON text
+    """
+    return orjson.dumps(obj, default=json_default, option=option | orjson.OPT_NON_STR_KEYS).decode()
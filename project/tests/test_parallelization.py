@@ -0,0 +1,49 @@
+"""
+Tests for batch fraud detection with malformed messages
+"""
+
+from agents.parallelization import GeographicRiskAgent, ParallelizationPattern
+from agents.workflow_agents.base_agents import FraudPatternDetectionAgent
+
+
+def test_pattern_batch_isolates_malformed_rows():
+    messages = [
+        {'message_id': 'OK', 'receiver_bic': 'TESTUS33', 'remittance_info': 'urgent'},
+        {'message_id': 'BAD', 'receiver_bic': None, 'remittance_info': 'urgent'}
+    ]
+    agent = FraudPatternDetectionAgent()
+
+    results = agent.analyze_batch(messages)
+
+    assert results[0] == agent.analyze(messages[0])
+    assert 'error' in results[1]
+    assert results[1]['risk_score'] == 0
+
+
+def test_geographic_batch_isolates_malformed_rows():
+    messages = [
+        {'message_id': 'OK', 'sender_bic': 'BANKIR22', 'receiver_bic': 'BANKKP22'},
+        {'message_id': 'BAD', 'sender_bic': 12345678, 'receiver_bic': 'BANKIR22'}
+    ]
+    agent = GeographicRiskAgent()
+
+    results = agent.analyze_batch(messages)
+
+    assert results[0] == agent.analyze(messages[0])
+    assert 'error' in results[1]
+    assert results[1]['risk_score'] == 0
+
+
+def test_malformed_message_keeps_batch_scores():
+    messages = [
+        {'message_id': 'TEST002', 'receiver_bic': 'TESTUS33', 'remittance_info': 'urgent'},
+        {'message_id': 'TEST003', 'receiver_bic': None, 'remittance_info': 'urgent'},
+        {'message_id': 'TEST004', 'sender_bic': 12345678, 'receiver_bic': 'BANKIR22'}
+    ]
+
+    processed = ParallelizationPattern().process_batch_parallel(messages)
+
+    # Same score as the well-formed message gets in a batch of its own
+    assert processed[0]['fraud_score'] == 20.0
+    assert 'error' in processed[1]['fraud_analysis'][1]
+    assert 'error' in processed[2]['fraud_analysis'][2]